@@ -159,13 +159,21 @@ def render(
     output: Path | None = typer.Option(None, "--output", "-o", help="Archivo de salida"),
 ) -> None:
     """Renderiza un video desde un spec YAML."""
-    from animatr.orchestrator import Orchestrator
+    from animatr.orchestrator import (
+        DEFAULT_RENDER_CACHE_DIR,
+        DEFAULT_TTS_CACHE_DIR,
+        Orchestrator,
+    )
     from animatr.schema import AnimationSpec
 
     console.print(f"[bold blue]Cargando spec:[/] {spec_file}")
 
     spec = AnimationSpec.from_yaml(spec_file)
-    orchestrator = Orchestrator(spec)
+    orchestrator = Orchestrator(
+        spec,
+        tts_cache_dir=DEFAULT_TTS_CACHE_DIR,
+        render_cache_dir=DEFAULT_RENDER_CACHE_DIR,
+    )
 
     output_path = output or Path(f"{spec_file.stem}.mp4")
     result = orchestrator.render(output_path)
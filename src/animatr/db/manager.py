@@ -2,16 +2,46 @@
 
 import json
 import sqlite3
+import threading
+import uuid
+from collections.abc import Generator, Iterable
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Generator
+from typing import Any
 
 from animatr.db.models import Asset, AssetType, Project, RenderJob, RenderStatus, SceneRender
 
 # Default database location
 DEFAULT_DB_PATH = Path.home() / ".animatr" / "projects.db"
 
+# Ruta especial para una base de datos en memoria (tests, caches)
+MEMORY_DB = ":memory:"
+
+_INSERT_PROJECT_SQL = """
+    INSERT INTO projects (name, description, spec_path, spec_yaml, output_path,
+                           status, created_at, updated_at, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_ASSET_SQL = """
+    INSERT INTO assets (project_id, name, asset_type, file_path, file_size,
+                        duration, width, height, created_at, metadata)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_SCENE_RENDER_SQL = """
+    INSERT INTO scene_renders (render_job_id, scene_id, status)
+    VALUES (?, ?, ?)
+"""
+
+
+def _load_metadata(raw: str | None) -> dict[str, Any]:
+    """Deserializa la columna metadata; la mayoría de filas llevan "{}"."""
+    if not raw or raw == "{}":
+        return {}
+    return json.loads(raw)
+
 
 class ProjectManager:
     """Gestiona la persistencia de proyectos ANIMATR en SQLite."""
@@ -22,18 +52,71 @@ class ProjectManager:
 
         Args:
             db_path: Ruta a la base de datos SQLite. Si es None, usa ubicación por defecto.
+                Con ":memory:" la base vive en memoria mientras exista el manager.
         """
         self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._uri: str | None = None
+        if str(self.db_path) == MEMORY_DB:
+            # Cada operación abre su propia conexión: una base en memoria con
+            # nombre y cache compartida, anclada por una conexión que vive
+            # tanto como el manager, mantiene los datos entre operaciones
+            self._uri = f"file:animatr-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._keepalive = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        else:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # Conexión de la transacción abierta con transaction(), por hilo
+        self._local = threading.local()
         self._init_database()
 
+    @contextmanager
+    def transaction(self) -> Generator[None, None, None]:
+        """
+        Agrupa varias operaciones en una sola transacción.
+
+        Dentro del bloque, todos los métodos del manager (en el mismo hilo)
+        reutilizan una conexión y el commit se hace una única vez al salir.
+        Si el bloque lanza una excepción se hace rollback de todo.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            # Transacción anidada: se une a la exterior
+            yield
+            return
+
+        with self._open_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield
+            finally:
+                self._local.conn = None
+
     @contextmanager
     def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
         """Context manager para conexiones a la base de datos."""
-        conn = sqlite3.connect(self.db_path)
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Dentro de transaction(): commit/rollback al cerrar el bloque
+            yield conn
+            return
+
+        with self._open_connection() as conn:
+            yield conn
+
+    @contextmanager
+    def _open_connection(self) -> Generator[sqlite3.Connection, None, None]:
+        """Abre una conexión nueva con commit al salir o rollback si falla."""
+        if self._uri is not None:
+            conn = sqlite3.connect(self._uri, uri=True)
+        else:
+            conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         # Enable foreign key support for cascade deletes
         conn.execute("PRAGMA foreign_keys = ON")
+        if self._uri is None:
+            # En WAL basta un fsync por checkpoint; sigue siendo seguro ante
+            # caídas del proceso (solo un corte de luz puede perder el último commit)
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
         try:
             yield conn
             conn.commit()
@@ -46,6 +129,10 @@ class ProjectManager:
     def _init_database(self) -> None:
         """Inicializa el esquema de la base de datos."""
         with self._get_connection() as conn:
+            if self._uri is None:
+                # Persistente en el fichero: basta activarlo una vez
+                conn.execute("PRAGMA journal_mode = WAL")
+
             cursor = conn.cursor()
 
             # Tabla de proyectos
@@ -132,6 +219,20 @@ class ProjectManager:
                 "CREATE INDEX IF NOT EXISTS idx_scene_renders_job ON scene_renders(render_job_id)"
             )
 
+            # Índices compuestos para los filtros por tipo/estado
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_assets_project_type "
+                "ON assets(project_id, asset_type)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_render_jobs_project_status "
+                "ON render_jobs(project_id, status)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_projects_status "
+                "ON projects(status, updated_at)"
+            )
+
     # ==========================================================================
     # Project CRUD
     # ==========================================================================
@@ -148,33 +249,62 @@ class ProjectManager:
         Returns:
             Project creado con ID asignado
         """
-        now = datetime.now().isoformat()
-        metadata = json.dumps(kwargs.get("metadata", {}))
+        row = self._project_row(datetime.now().isoformat(), name, description, **kwargs)
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO projects (name, description, spec_path, spec_yaml, output_path,
-                                       status, created_at, updated_at, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    name,
-                    description,
-                    kwargs.get("spec_path"),
-                    kwargs.get("spec_yaml"),
-                    kwargs.get("output_path"),
-                    kwargs.get("status", "draft"),
-                    now,
-                    now,
-                    metadata,
-                ),
-            )
+            cursor.execute(_INSERT_PROJECT_SQL, row)
             project_id = cursor.lastrowid
 
         return self.get_project(project_id)  # type: ignore
 
+    def bulk_create_projects(self, specs: Iterable[dict[str, Any]]) -> list[Project]:
+        """
+        Crea varios proyectos en una sola transacción.
+
+        Args:
+            specs: Un dict por proyecto con los argumentos de create_project
+                (name obligatorio; description, spec_path, metadata, etc.)
+
+        Returns:
+            Projects creados, en el mismo orden
+        """
+        now = datetime.now().isoformat()
+        rows = [self._project_row(now, **spec) for spec in specs]
+        if not rows:
+            return []
+
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            ids = []
+            for row in rows:
+                cursor.execute(_INSERT_PROJECT_SQL, row)
+                ids.append(cursor.lastrowid)
+
+            placeholders = ", ".join("?" * len(ids))
+            cursor.execute(
+                f"SELECT * FROM projects WHERE id IN ({placeholders}) ORDER BY id", ids
+            )
+            created = cursor.fetchall()
+
+        return [self._row_to_project(row) for row in created]
+
+    def _project_row(
+        self, created_at: str, name: str, description: str = "", **kwargs: Any
+    ) -> tuple[Any, ...]:
+        """Construye los parámetros del INSERT de un proyecto."""
+        return (
+            name,
+            description,
+            kwargs.get("spec_path"),
+            kwargs.get("spec_yaml"),
+            kwargs.get("output_path"),
+            kwargs.get("status", "draft"),
+            created_at,
+            created_at,
+            json.dumps(kwargs.get("metadata", {})),
+        )
+
     def get_project(self, project_id: int) -> Project | None:
         """Obtiene un proyecto por ID."""
         with self._get_connection() as conn:
@@ -263,7 +393,9 @@ class ProjectManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM projects WHERE id = ?", (project_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+
+        return deleted
 
     def _row_to_project(self, row: sqlite3.Row) -> Project:
         """Convierte una fila de SQLite a objeto Project."""
@@ -277,7 +409,7 @@ class ProjectManager:
             status=row["status"],
             created_at=datetime.fromisoformat(row["created_at"]),
             updated_at=datetime.fromisoformat(row["updated_at"]),
-            metadata=json.loads(row["metadata"] or "{}"),
+            metadata=_load_metadata(row["metadata"]),
         )
 
     # ==========================================================================
@@ -290,42 +422,97 @@ class ProjectManager:
         name: str,
         asset_type: AssetType | str,
         file_path: str | Path,
+        file_size: int | None = None,
         **kwargs: Any,
     ) -> Asset:
-        """Añade un asset a un proyecto."""
-        if isinstance(asset_type, str):
-            asset_type = AssetType(asset_type)
+        """Añade un asset a un proyecto.
 
-        file_path = Path(file_path)
-        file_size = file_path.stat().st_size if file_path.exists() else 0
-        now = datetime.now().isoformat()
-        metadata = json.dumps(kwargs.get("metadata", {}))
+        Si no se pasa file_size se lee del fichero (0 si no existe).
+        """
+        row = self._asset_row(
+            project_id,
+            name,
+            asset_type,
+            file_path,
+            datetime.now().isoformat(),
+            file_size=file_size,
+            **kwargs,
+        )
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO assets (project_id, name, asset_type, file_path, file_size,
-                                    duration, width, height, created_at, metadata)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    project_id,
-                    name,
-                    asset_type.value,
-                    str(file_path),
-                    file_size,
-                    kwargs.get("duration"),
-                    kwargs.get("width"),
-                    kwargs.get("height"),
-                    now,
-                    metadata,
-                ),
-            )
+            cursor.execute(_INSERT_ASSET_SQL, row)
             asset_id = cursor.lastrowid
 
         return self.get_asset(asset_id)  # type: ignore
 
+    def bulk_add_assets(
+        self,
+        project_id: int,
+        items: Iterable[tuple[Any, ...]],
+    ) -> int:
+        """
+        Añade varios assets a un proyecto en una sola transacción.
+
+        Args:
+            project_id: ID del proyecto
+            items: Tuplas (name, asset_type, file_path) o
+                (name, asset_type, file_path, file_size) si el tamaño ya se conoce
+
+        Returns:
+            Número de assets insertados
+        """
+        now = datetime.now().isoformat()
+        rows = []
+        for item in items:
+            name, asset_type, file_path = item[:3]
+            file_size = item[3] if len(item) > 3 else None
+            rows.append(
+                self._asset_row(
+                    project_id, name, asset_type, file_path, now, file_size=file_size
+                )
+            )
+
+        with self._get_connection() as conn:
+            conn.executemany(_INSERT_ASSET_SQL, rows)
+
+        return len(rows)
+
+    def _asset_row(
+        self,
+        project_id: int,
+        name: str,
+        asset_type: AssetType | str,
+        file_path: str | Path,
+        created_at: str,
+        file_size: int | None = None,
+        **kwargs: Any,
+    ) -> tuple[Any, ...]:
+        """Construye los parámetros del INSERT de un asset."""
+        if isinstance(asset_type, str):
+            asset_type = AssetType(asset_type)
+
+        file_path = Path(file_path)
+        if file_size is None:
+            # Un solo stat (exists() + stat() serían dos)
+            try:
+                file_size = file_path.stat().st_size
+            except FileNotFoundError:
+                file_size = 0
+
+        return (
+            project_id,
+            name,
+            asset_type.value,
+            str(file_path),
+            file_size,
+            kwargs.get("duration"),
+            kwargs.get("width"),
+            kwargs.get("height"),
+            created_at,
+            json.dumps(kwargs.get("metadata", {})),
+        )
+
     def get_asset(self, asset_id: int) -> Asset | None:
         """Obtiene un asset por ID."""
         with self._get_connection() as conn:
@@ -369,7 +556,9 @@ class ProjectManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM assets WHERE id = ?", (asset_id,))
-            return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+
+        return deleted
 
     def _row_to_asset(self, row: sqlite3.Row) -> Asset:
         """Convierte una fila de SQLite a objeto Asset."""
@@ -384,7 +573,7 @@ class ProjectManager:
             width=row["width"],
             height=row["height"],
             created_at=datetime.fromisoformat(row["created_at"]),
-            metadata=json.loads(row["metadata"] or "{}"),
+            metadata=_load_metadata(row["metadata"]),
         )
 
     # ==========================================================================
@@ -536,7 +725,7 @@ class ProjectManager:
             started_at=datetime.fromisoformat(row["started_at"]) if row["started_at"] else None,
             completed_at=datetime.fromisoformat(row["completed_at"]) if row["completed_at"] else None,
             created_at=datetime.fromisoformat(row["created_at"]),
-            metadata=json.loads(row["metadata"] or "{}"),
+            metadata=_load_metadata(row["metadata"]),
         )
 
     # ==========================================================================
@@ -548,16 +737,23 @@ class ProjectManager:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(
-                """
-                INSERT INTO scene_renders (render_job_id, scene_id, status)
-                VALUES (?, ?, ?)
-                """,
+                _INSERT_SCENE_RENDER_SQL,
                 (render_job_id, scene_id, RenderStatus.PENDING.value),
             )
             scene_render_id = cursor.lastrowid
 
         return self.get_scene_render(scene_render_id)  # type: ignore
 
+    def bulk_add_scene_renders(self, render_job_id: int, scene_ids: Iterable[str]) -> int:
+        """Añade los scene renders de un job en una sola transacción."""
+        pending = RenderStatus.PENDING.value
+        rows = [(render_job_id, scene_id, pending) for scene_id in scene_ids]
+
+        with self._get_connection() as conn:
+            conn.executemany(_INSERT_SCENE_RENDER_SQL, rows)
+
+        return len(rows)
+
     def get_scene_render(self, scene_render_id: int) -> SceneRender | None:
         """Obtiene un scene render por ID."""
         with self._get_connection() as conn:
@@ -658,24 +854,49 @@ class ProjectManager:
         if not project:
             return None
 
-        assets = self.list_assets(project_id)
-        jobs = self.list_render_jobs(project_id, limit=10)
+        # Agregados en SQL: no se materializan assets ni jobs completos
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT asset_type, COUNT(*) FROM assets WHERE project_id = ? "
+                "GROUP BY asset_type",
+                (project_id,),
+            )
+            asset_counts = dict(cursor.fetchall())
+
+            cursor.execute(
+                """
+                SELECT COUNT(*),
+                       COALESCE(SUM(status = ?), 0),
+                       COALESCE(SUM(status = ?), 0)
+                FROM render_jobs WHERE project_id = ?
+                """,
+                (RenderStatus.COMPLETED.value, RenderStatus.FAILED.value, project_id),
+            )
+            total_jobs, completed_jobs, failed_jobs = cursor.fetchone()
+
+            cursor.execute(
+                "SELECT * FROM render_jobs WHERE project_id = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (project_id,),
+            )
+            latest = cursor.fetchone()
 
         return {
             "project": project.to_dict(),
             "assets": {
-                "total": len(assets),
+                "total": sum(asset_counts.values()),
                 "by_type": {
-                    t.value: len([a for a in assets if a.asset_type == t])
+                    t.value: asset_counts[t.value]
                     for t in AssetType
-                    if any(a.asset_type == t for a in assets)
+                    if t.value in asset_counts
                 },
             },
             "render_jobs": {
-                "total": len(jobs),
-                "latest": jobs[0].to_dict() if jobs else None,
-                "completed": len([j for j in jobs if j.status == RenderStatus.COMPLETED]),
-                "failed": len([j for j in jobs if j.status == RenderStatus.FAILED]),
+                "total": total_jobs,
+                "latest": self._row_to_render_job(latest).to_dict() if latest else None,
+                "completed": completed_jobs,
+                "failed": failed_jobs,
             },
         }
 
@@ -686,10 +907,15 @@ class ProjectManager:
 
     def backup(self, backup_path: Path) -> None:
         """Crea un backup de la base de datos."""
-        import shutil
-
         backup_path.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(self.db_path, backup_path)
+
+        # API de backup de SQLite: copia consistente, también para ":memory:"
+        dest = sqlite3.connect(backup_path)
+        try:
+            with self._get_connection() as conn:
+                conn.backup(dest)
+        finally:
+            dest.close()
 
     def stats(self) -> dict[str, Any]:
         """Obtiene estadísticas generales."""
@@ -29,7 +29,7 @@ class AssetType(Enum):
     OTHER = "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     """Representa un proyecto ANIMATR."""
 
@@ -70,7 +70,7 @@ class Project:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     """Representa un asset del proyecto."""
 
@@ -113,7 +113,7 @@ class Asset:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class RenderJob:
     """Representa un trabajo de renderizado."""
 
@@ -171,7 +171,7 @@ class RenderJob:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SceneRender:
     """Estado de renderizado de una escena individual."""
 
@@ -4,18 +4,29 @@ Este engine integra con Blender para composición de escenas,
 cámaras, iluminación y render final.
 """
 
+import hashlib
 import json
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 from animatr.engines.base import Engine, EngineResult
+from animatr.engines.ffmpeg import h264_encoder
 from animatr.schema import Background, Character
 
+# Cache persistente de renders de Blender compartido entre renders (opt-in,
+# junto al cache de TTS: solo hay aciertos si el audio vive en un path estable)
+DEFAULT_RENDER_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "animatr"
+    / "blender"
+)
 
 @dataclass
 class BlenderSceneConfig:
@@ -31,6 +42,8 @@ class BlenderSceneConfig:
     character_position: str = "center"
     audio_path: Path | None = None
     camera_motion: str = "static"  # static, pan, zoom, orbit
+    container: str = "mp4"  # mp4, mov o webm (OutputConfig.format)
+    worker_id: int = 0  # Aísla el cache de Blender entre workers paralelos
 
 
 @dataclass
@@ -48,8 +61,17 @@ class BlenderEngine(Engine):
     Blender debe estar instalado y accesible vía CLI.
     """
 
+    # Contenedor → (ffmpeg.format, ffmpeg.codec, ffmpeg.audio_codec) de
+    # Blender. Cada escena sale ya en el codec final y se concatena sin
+    # re-encode.
+    OUTPUT_FORMATS = {
+        "mp4": ("MPEG4", "H264", "AAC"),
+        "mov": ("QUICKTIME", "H264", "AAC"),
+        "webm": ("WEBM", "WEBM", "OPUS"),
+    }
+
     # Configuraciones de cámara predefinidas
-    CAMERA_PRESETS = {
+    CAMERA_PRESETS = MappingProxyType({
         "static": {
             "location": (0, -10, 2),
             "rotation": (80, 0, 0),
@@ -96,17 +118,28 @@ class BlenderEngine(Engine):
                 {"frame": -1, "rotation": (80, 0, -15)},
             ],
         },
-    }
+    })
 
     # Posiciones de personaje en el espacio 3D
-    CHARACTER_POSITIONS = {
+    CHARACTER_POSITIONS = MappingProxyType({
         "left": (-3, 0, 0),
         "center": (0, 0, 0),
         "right": (3, 0, 0),
-    }
+    })
 
-    def __init__(self) -> None:
+    # Longitud máxima del script pasado por línea de comandos
+    # (CreateProcess en Windows limita a 32767 caracteres)
+    MAX_INLINE_SCRIPT = 30_000
+
+    def __init__(self, cache_dir: Path | None = None) -> None:
+        """Inicializa el engine.
+
+        Args:
+            cache_dir: Directorio de renders reutilizables entre ejecuciones.
+                Si es None no se cachea (ver DEFAULT_RENDER_CACHE_DIR)
+        """
         self._temp_dir = Path(tempfile.mkdtemp(prefix="animatr_blender_"))
+        self._cache_dir = cache_dir
         self._blender_path = self._find_blender()
 
     def _find_blender(self) -> Path | None:
@@ -153,14 +186,42 @@ class BlenderEngine(Engine):
             return self._process_without_blender(config)
 
         # Generar script Python para Blender
-        script_path = self._generate_blender_script(config)
+        script = self._generate_blender_script(config)
+
+        # Con cache, el video se nombra por el hash del script y de los
+        # archivos de entrada: si ya existe, la escena es idéntica a una ya
+        # renderizada (en esta u otra ejecución) y no se invoca Blender. Las
+        # escenas con personaje no se cachean: Moho regenera sus frames en
+        # cada render, así que nunca habría acierto.
+        key = hashlib.blake2b(script.encode(), digest_size=8)
+        if self._cache_dir is not None and config.character_frames_dir is None:
+            key.update(self._input_fingerprint(config).encode())
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            output_dir = self._cache_dir
+        else:
+            output_dir = self._temp_dir
+        output_path = output_dir / (
+            f"{config.scene_id}_{key.hexdigest()}.{config.container}"
+        )
+        cached = output_path.exists()
+        render_time = 0.0
+
+        if not cached:
+            # Ejecutar Blender sobre un archivo parcial propio de este proceso
+            # para que un render interrumpido (o uno concurrente de otra
+            # ejecución) nunca quede como entrada válida del cache
+            partial_path = output_path.with_suffix(
+                f".{os.getpid()}.{config.worker_id}.part.{config.container}"
+            )
+            success, render_time = self._run_blender(
+                script, partial_path, worker_id=config.worker_id
+            )
 
-        # Ejecutar Blender
-        output_path = self._temp_dir / f"{config.scene_id}.mp4"
-        success, render_time = self._run_blender(script_path, output_path)
+            if not success:
+                partial_path.unlink(missing_ok=True)
+                return self._process_without_blender(config)
 
-        if not success:
-            return self._process_without_blender(config)
+            os.replace(partial_path, output_path)
 
         frame_count = int(config.duration * config.fps)
 
@@ -175,9 +236,32 @@ class BlenderEngine(Engine):
                 "engine": "blender",
                 "camera": config.camera_motion,
                 "resolution": f"{config.width}x{config.height}",
+                "cached": cached,
             },
         )
 
+    @staticmethod
+    def _input_fingerprint(config: BlenderSceneConfig) -> str:
+        """Tamaño y mtime de los archivos que lee el script.
+
+        El script solo contiene sus paths: sin esto, un audio regenerado en
+        el mismo path reutilizaría un video obsoleto.
+        """
+        paths: list[Path] = []
+        if config.audio_path:
+            paths.append(config.audio_path)
+        if config.background and config.background.image:
+            paths.append(Path(config.background.image))
+
+        parts = []
+        for path in paths:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            parts.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+        return "\n".join(parts)
+
     def validate(self, config: BlenderSceneConfig) -> bool:
         """Valida la configuración del engine."""
         if config.duration <= 0:
@@ -188,10 +272,17 @@ class BlenderEngine(Engine):
             return False
         return True
 
-    def _generate_blender_script(self, config: BlenderSceneConfig) -> Path:
-        """Genera el script Python para Blender."""
+    def _generate_blender_script(self, config: BlenderSceneConfig) -> str:
+        """Genera el script Python para Blender.
+
+        El path de salida no se embebe en el script: Blender lo recibe como
+        argumento tras ``--``, de modo que el texto del script depende solo
+        de la configuración de la escena y sirve como clave de cache.
+        """
         total_frames = int(config.duration * config.fps)
-        output_path = self._temp_dir / f"{config.scene_id}.mp4"
+        ffmpeg_format, video_codec, audio_codec = self.OUTPUT_FORMATS.get(
+            config.container, self.OUTPUT_FORMATS["mp4"]
+        )
 
         # Obtener configuración de cámara
         camera_preset = self.CAMERA_PRESETS.get(
@@ -236,6 +327,7 @@ class BlenderEngine(Engine):
 import bpy
 import math
 import os
+import sys
 
 # Limpiar escena
 bpy.ops.wm.read_factory_settings(use_empty=True)
@@ -248,7 +340,10 @@ CONFIG = {{
     "width": {config.width},
     "height": {config.height},
     "total_frames": {total_frames},
-    "output_path": "{output_path}",
+    "output_path": sys.argv[sys.argv.index("--") + 1],
+    "ffmpeg_format": "{ffmpeg_format}",
+    "video_codec": "{video_codec}",
+    "audio_codec": "{audio_codec}",
     "bg_color": {bg_color},
     "bg_image": "{bg_image_path}",
     "char_frames": "{char_frames_path}",
@@ -262,6 +357,47 @@ CAMERA_CONFIG = {{
     "keyframes": {json.dumps(camera_preset.get("keyframes", []))},
 }}
 
+# Luces de 3 puntos: (nombre, location, energy, size)
+LIGHTS = [
+    ("KeyLight", (4, -4, 6), 500, 5),
+    ("FillLight", (-3, -3, 4), 200, 3),
+    ("BackLight", (0, 4, 5), 300, 4),
+]
+
+# Se usa bpy.data en lugar de bpy.ops: los operadores dependen del contexto
+# y reconstruyen el depsgraph en cada llamada.
+def link_object(name, data, location):
+    """Crea un objeto con los datos dados y lo enlaza a la escena."""
+    obj = bpy.data.objects.new(name, data)
+    obj.location = location
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+def new_plane(name, size, location):
+    """Crea un plano con UVs, equivalente a primitive_plane_add."""
+    h = size / 2
+    mesh = bpy.data.meshes.new(name)
+    vertices = [(-h, -h, 0), (h, -h, 0), (h, h, 0), (-h, h, 0)]
+    mesh.from_pydata(vertices, [], [(0, 1, 2, 3)])
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    for loop, uv in zip(uv_layer.data, ((0, 0), (1, 0), (1, 1), (0, 1))):
+        loop.uv = uv
+    mesh.update()
+    return link_object(name, mesh, location)
+
+def new_cube(name, size, location):
+    """Crea un cubo, equivalente a primitive_cube_add."""
+    h = size / 2
+    verts = [(x, y, z) for x in (-h, h) for y in (-h, h) for z in (-h, h)]
+    faces = [
+        (0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1),
+        (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3),
+    ]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    return link_object(name, mesh, location)
+
 def setup_scene():
     """Configura la escena básica."""
     scene = bpy.context.scene
@@ -273,10 +409,10 @@ def setup_scene():
 
     # Formato de salida
     scene.render.image_settings.file_format = 'FFMPEG'
-    scene.render.ffmpeg.format = 'MPEG4'
-    scene.render.ffmpeg.codec = 'H264'
+    scene.render.ffmpeg.format = CONFIG["ffmpeg_format"]
+    scene.render.ffmpeg.codec = CONFIG["video_codec"]
     scene.render.ffmpeg.constant_rate_factor = 'MEDIUM'
-    scene.render.ffmpeg.audio_codec = 'AAC'
+    scene.render.ffmpeg.audio_codec = CONFIG["audio_codec"]
     scene.render.filepath = CONFIG["output_path"]
 
     # Color de fondo del mundo
@@ -288,16 +424,15 @@ def setup_scene():
 
 def setup_camera():
     """Configura la cámara con animación."""
-    bpy.ops.object.camera_add(
-        location=CAMERA_CONFIG["location"],
-        rotation=(
-            math.radians(CAMERA_CONFIG["rotation"][0]),
-            math.radians(CAMERA_CONFIG["rotation"][1]),
-            math.radians(CAMERA_CONFIG["rotation"][2])
-        )
+    cam_data = bpy.data.cameras.new("AnimatrCamera")
+    camera = bpy.data.objects.new("AnimatrCamera", cam_data)
+    camera.location = CAMERA_CONFIG["location"]
+    camera.rotation_euler = (
+        math.radians(CAMERA_CONFIG["rotation"][0]),
+        math.radians(CAMERA_CONFIG["rotation"][1]),
+        math.radians(CAMERA_CONFIG["rotation"][2])
     )
-    camera = bpy.context.active_object
-    camera.name = "AnimatrCamera"
+    bpy.context.scene.collection.objects.link(camera)
     bpy.context.scene.camera = camera
 
     # Aplicar keyframes de animación
@@ -324,34 +459,19 @@ def setup_camera():
 
 def setup_lighting():
     """Configura iluminación de 3 puntos."""
-    # Key light
-    bpy.ops.object.light_add(type='AREA', location=(4, -4, 6))
-    key = bpy.context.active_object
-    key.name = "KeyLight"
-    key.data.energy = 500
-    key.data.size = 5
-
-    # Fill light
-    bpy.ops.object.light_add(type='AREA', location=(-3, -3, 4))
-    fill = bpy.context.active_object
-    fill.name = "FillLight"
-    fill.data.energy = 200
-    fill.data.size = 3
-
-    # Back light
-    bpy.ops.object.light_add(type='AREA', location=(0, 4, 5))
-    back = bpy.context.active_object
-    back.name = "BackLight"
-    back.data.energy = 300
-    back.data.size = 4
+    for name, location, energy, size in LIGHTS:
+        light_data = bpy.data.lights.new(name, type='AREA')
+        light_data.energy = energy
+        light_data.size = size
+        light = bpy.data.objects.new(name, light_data)
+        light.location = location
+        bpy.context.scene.collection.objects.link(light)
 
 def setup_background():
     """Configura el fondo de la escena."""
     if CONFIG["bg_image"] and os.path.exists(CONFIG["bg_image"]):
         # Crear plano con imagen de fondo
-        bpy.ops.mesh.primitive_plane_add(size=20, location=(0, 5, 0))
-        bg_plane = bpy.context.active_object
-        bg_plane.name = "Background"
+        bg_plane = new_plane("Background", size=20, location=(0, 5, 0))
         bg_plane.rotation_euler = (math.radians(90), 0, 0)
 
         # Material con imagen
@@ -375,18 +495,15 @@ def setup_character():
     """Configura el personaje usando secuencia de frames."""
     if not CONFIG["char_frames"] or not os.path.exists(CONFIG["char_frames"]):
         # Crear placeholder
-        bpy.ops.mesh.primitive_cube_add(size=2, location=CONFIG["char_position"])
-        cube = bpy.context.active_object
-        cube.name = "CharacterPlaceholder"
+        new_cube("CharacterPlaceholder", size=2, location=CONFIG["char_position"])
         return
 
     # Crear plano para la secuencia de imágenes
-    bpy.ops.mesh.primitive_plane_add(
+    char_plane = new_plane(
+        "Character",
         size=4,
         location=(CONFIG["char_position"][0], CONFIG["char_position"][1], 2)
     )
-    char_plane = bpy.context.active_object
-    char_plane.name = "Character"
 
     # Material con secuencia de imágenes
     mat = bpy.data.materials.new("CharacterMaterial")
@@ -453,16 +570,23 @@ render()
 print("ANIMATR Blender: ¡Completado!")
 '''
 
-        script_path = self._temp_dir / f"{config.scene_id}_blender.py"
-        script_path.write_text(script)
-        return script_path
+        return script
 
     def _run_blender(
         self,
-        script_path: Path,
+        script: str,
         output_path: Path,
+        worker_id: int = 0,
     ) -> tuple[bool, float]:
-        """Ejecuta Blender con el script generado."""
+        """Ejecuta Blender con el script generado.
+
+        El script se pasa inline con ``--python-expr``, sin escribirlo a
+        disco; solo si excede el límite de longitud de la línea de comandos
+        se guarda en un archivo propio de esta salida.
+
+        Cada worker usa su propio XDG_CACHE_HOME para que procesos de
+        Blender en paralelo no compitan por los locks del cache de shaders.
+        """
         import time
 
         if not self._blender_path:
@@ -471,16 +595,29 @@ print("ANIMATR Blender: ¡Completado!")
         start_time = time.time()
 
         try:
+            if len(script) <= self.MAX_INLINE_SCRIPT:
+                script_args = ["--python-expr", script]
+            else:
+                script_path = output_path.with_suffix(".py")
+                script_path.write_text(script)
+                script_args = ["--python", str(script_path)]
+
             cmd = [
                 str(self._blender_path),
                 "--background",
-                "--python", str(script_path),
+                *script_args,
+                "--", str(output_path),
             ]
 
+            env = os.environ.copy()
+            env["XDG_CACHE_HOME"] = str(self._temp_dir / f"cache_{worker_id}")
+            os.makedirs(env["XDG_CACHE_HOME"], exist_ok=True)
+
             result = subprocess.run(
                 cmd,
                 capture_output=True,
                 timeout=1800,  # 30 minutos máximo
+                env=env,
             )
 
             render_time = time.time() - start_time
@@ -500,7 +637,7 @@ print("ANIMATR Blender: ¡Completado!")
 
     def _process_without_blender(self, config: BlenderSceneConfig) -> BlenderResult:
         """Procesa la escena sin Blender usando FFmpeg."""
-        output_path = self._temp_dir / f"{config.scene_id}.mp4"
+        output_path = self._temp_dir / f"{config.scene_id}.{config.container}"
         total_frames = int(config.duration * config.fps)
 
         # Color de fondo
@@ -508,28 +645,47 @@ print("ANIMATR Blender: ¡Completado!")
         if config.background and config.background.color:
             bg_color = config.background.color.replace("#", "0x")
 
+        color_source = (
+            f"color=c={bg_color}:s={config.width}x{config.height}"
+            f":r={config.fps}:d={config.duration}"
+        )
+        if config.container == "webm":
+            video_codec = ["-c:v", "libvpx-vp9", "-b:v", "0", "-crf", "32"]
+            audio_codec = "libopus"
+        else:
+            encoder = h264_encoder()
+            video_codec = ["-c:v", encoder]
+            audio_codec = "aac"
+            if encoder == "libx264":
+                # Los encoders por hardware eligen su propio formato (NV12)
+                video_codec += ["-pix_fmt", "yuv420p"]
+
         try:
             if config.character_frames_dir and config.character_frames_dir.exists():
-                # Combinar frames del personaje con fondo
+                # Combinar frames del personaje con fondo: el color se genera
+                # dentro del mismo filter_complex que hace el overlay
                 frame_pattern = str(config.character_frames_dir / "frame_%05d.png")
 
                 cmd = [
                     "ffmpeg",
+                    "-nostdin", "-loglevel", "error",
                     "-y",
                     "-framerate", str(config.fps),
                     "-i", frame_pattern,
-                    "-f", "lavfi",
-                    "-i", f"color=c={bg_color}:s={config.width}x{config.height}:r={config.fps}:d={config.duration}",
-                    "-filter_complex", "[1:v][0:v]overlay=(W-w)/2:(H-h)/2",
                 ]
 
                 # Agregar audio si existe
                 if config.audio_path and config.audio_path.exists():
-                    cmd.extend(["-i", str(config.audio_path), "-c:a", "aac"])
+                    cmd.extend([
+                        "-i", str(config.audio_path),
+                        "-map", "1:a", "-c:a", audio_codec,
+                    ])
 
                 cmd.extend([
-                    "-c:v", "libx264",
-                    "-pix_fmt", "yuv420p",
+                    "-filter_complex",
+                    f"{color_source}[bg];[bg][0:v]overlay=(W-w)/2:(H-h)/2[v]",
+                    "-map", "[v]",
+                    *video_codec,
                     "-shortest",
                     str(output_path),
                 ])
@@ -538,20 +694,21 @@ print("ANIMATR Blender: ¡Completado!")
                 # Solo generar video con fondo de color
                 cmd = [
                     "ffmpeg",
+                    "-nostdin", "-loglevel", "error",
                     "-y",
                     "-f", "lavfi",
-                    "-i", f"color=c={bg_color}:s={config.width}x{config.height}:r={config.fps}:d={config.duration}",
+                    "-i", color_source,
                 ]
 
                 if config.audio_path and config.audio_path.exists():
                     cmd.extend([
                         "-i", str(config.audio_path),
-                        "-c:a", "aac",
+                        "-c:a", audio_codec,
                         "-shortest",
                     ])
 
                 cmd.extend([
-                    "-c:v", "libx264",
+                    *video_codec,
                     str(output_path),
                 ])
 
@@ -0,0 +1,87 @@
+"""Helpers de FFmpeg compartidos por los engines y el orchestrator.
+
+Elección del encoder H.264 (por hardware o libx264) y sus flags de calidad.
+"""
+
+import functools
+import os
+import subprocess
+import sys
+
+# Flags de calidad equivalentes a libx264 -crf 23 para cada encoder
+_H264_QUALITY_ARGS = {
+    "libx264": ["-preset", "medium", "-crf", "23"],
+    "h264_nvenc": ["-preset", "p4", "-rc", "vbr", "-cq", "23"],
+    "h264_videotoolbox": ["-q:v", "50"],
+    "h264_amf": ["-quality", "balanced"],
+    "h264_qsv": ["-global_quality", "23"],
+}
+
+
+def h264_encoder() -> str:
+    """Encoder H.264 a usar según ANIMATR_ENCODER.
+
+    ``auto`` (por defecto) detecta el hardware disponible, ``cpu`` fuerza
+    libx264 y cualquier otro valor (``nvenc``, ``videotoolbox``, ``amf``,
+    ``qsv``) fuerza ese encoder sin probarlo, para renders reproducibles.
+    """
+    return _h264_encoder(os.environ.get("ANIMATR_ENCODER", "auto").lower())
+
+
+def h264_codec_args() -> list[str]:
+    """Argumentos ``-c:v`` y de calidad para el encoder H.264 elegido."""
+    encoder = h264_encoder()
+    return ["-c:v", encoder, *_H264_QUALITY_ARGS.get(encoder, [])]
+
+
+@functools.cache
+def _h264_encoder(preference: str = "auto") -> str:
+    """Detecta una vez el mejor encoder H.264 disponible en FFmpeg.
+
+    Prefiere VideoToolbox (macOS), NVENC (NVIDIA), AMF (AMD) o QSV (Intel)
+    y cae a libx264 si ninguno aparece o no logra codificar un frame de
+    prueba.
+    """
+    if preference == "cpu":
+        return "libx264"
+    if preference != "auto":
+        if preference.startswith(("h264_", "lib")):
+            return preference
+        return f"h264_{preference}"
+
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-nostdin", "-hide_banner", "-encoders"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return "libx264"
+
+    candidates = ["h264_nvenc", "h264_amf", "h264_qsv"]
+    if sys.platform == "darwin":
+        candidates.insert(0, "h264_videotoolbox")
+
+    for encoder in candidates:
+        if encoder not in result.stdout:
+            continue
+        # Listado no implica hardware presente: probar un frame real
+        try:
+            probe = subprocess.run(
+                [
+                    "ffmpeg", "-nostdin", "-hide_banner", "-loglevel", "error",
+                    "-f", "lavfi", "-i", "color=s=256x256:d=0.1",
+                    "-frames:v", "1", "-c:v", encoder, "-f", "null", "-",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+            )
+        except (OSError, subprocess.SubprocessError):
+            continue
+        if probe.returncode == 0:
+            return encoder
+
+    return "libx264"
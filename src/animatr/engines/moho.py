@@ -4,18 +4,149 @@ Este engine integra con Moho Pro para animación de personajes 2D.
 Utiliza Lua scripting para controlar Moho headless y generar frames.
 """
 
+import atexit
+import functools
 import json
 import os
 import shutil
+import string
 import subprocess
 import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+import mutagen
+
 from animatr.engines.base import Engine, EngineResult
 from animatr.schema import AudioConfig, Character
 
+# Cabecera del script Lua: única parte que varía por render
+_LUA_TEMPLATE = string.Template('''-- ANIMATR Moho Animation Script
+-- Auto-generated for: ${asset}
+
+-- Configuración
+local CONFIG = {
+    output_dir = "${output_dir}",
+    total_frames = ${total_frames},
+    fps = ${fps},
+    width = ${width},
+    height = ${height},
+    expression = "${expression}",
+}
+
+-- Datos de expresión
+local EXPRESSION = ${expression_lua}
+
+-- Keyframes de lip-sync
+local LIP_SYNC = {
+${lip_sync_keyframes}}
+''')
+
+# Cuerpo estático: tablas y funciones idénticas en cada render. Se concatena
+# tras la cabecera porque las funciones usan sus locales como upvalues.
+_LUA_STATIC_BODY = '''
+-- Mapeo de visemes a valores de bone
+local VISEME_VALUES = {
+    mouth_rest = 0,
+    mouth_closed = 0.1,
+    mouth_open = 0.8,
+    mouth_round = 0.6,
+    mouth_wide = 0.7,
+    mouth_smile = 0.5,
+    mouth_narrow = 0.3,
+    mouth_f = 0.4,
+    mouth_l = 0.35,
+    mouth_th = 0.45,
+}
+
+-- Función principal de animación
+function AnimateCharacter(moho)
+    local layer = moho:LayerAsGroup(moho.layer)
+
+    if layer == nil then
+        print("Error: No se encontró el layer del personaje")
+        return
+    end
+
+    -- Aplicar expresión base
+    ApplyExpression(moho, layer, EXPRESSION)
+
+    -- Aplicar lip-sync frame por frame
+    for i, keyframe in ipairs(LIP_SYNC) do
+        local frame = keyframe.frame
+        local viseme = keyframe.viseme
+        local value = VISEME_VALUES[viseme] or 0
+
+        ApplyMouthShape(moho, layer, frame, value)
+    end
+
+    -- El render lo hace Moho en modo batch (-r -start -end en _run_moho)
+end
+
+function ApplyExpression(moho, layer, expr)
+    -- Buscar bones de expresión
+    local skeleton = moho:LayerAsSkeleton(layer)
+    if skeleton == nil then return end
+
+    local skel = skeleton:Skeleton()
+    if skel == nil then return end
+
+    for i = 0, skel:CountBones() - 1 do
+        local bone = skel:Bone(i)
+        local name = bone:Name()
+
+        if string.find(name, "brow") then
+            -- Aplicar valor a cejas
+            local angle = expr.brows * 0.3
+            bone.fAngle:SetValue(0, angle)
+        elseif string.find(name, "eye") then
+            -- Aplicar valor a ojos
+            local scale = 1 + expr.eyes * 0.2
+            bone.fScale:SetValue(0, scale)
+        end
+    end
+end
+
+function ApplyMouthShape(moho, layer, frame, value)
+    local skeleton = moho:LayerAsSkeleton(layer)
+    if skeleton == nil then return end
+
+    local skel = skeleton:Skeleton()
+    if skel == nil then return end
+
+    for i = 0, skel:CountBones() - 1 do
+        local bone = skel:Bone(i)
+        local name = bone:Name()
+
+        if string.find(name:lower(), "mouth") or string.find(name:lower(), "jaw") then
+            -- Aplicar apertura de boca
+            local currentAngle = bone.fAngle:GetValue(0)
+            local targetAngle = currentAngle + (value * 0.5)
+            bone.fAngle:SetValue(frame, targetAngle)
+        end
+    end
+end
+
+-- Ejecutar
+AnimateCharacter(moho)
+print("Animación completada: " .. CONFIG.total_frames .. " frames")
+'''
+
+
+@functools.cache
+def _rhubarb_path() -> str | None:
+    """Busca Rhubarb en el PATH una sola vez por proceso."""
+    return shutil.which("rhubarb")
+
+
+def _lua_escape(value: str) -> str:
+    """Escapa un valor para insertarlo dentro de un string Lua."""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
 
 @dataclass
 class MohoConfig:
@@ -57,7 +188,7 @@ class MohoEngine(Engine):
     """
 
     # Mapeo de fonemas a poses de Moho (visemes)
-    PHONEME_TO_VISEME = {
+    PHONEME_TO_VISEME = MappingProxyType({
         # Vocales
         "AA": "mouth_open",
         "AE": "mouth_open",
@@ -102,7 +233,7 @@ class MohoEngine(Engine):
         # Silencio
         "SIL": "mouth_rest",
         "SP": "mouth_rest",
-    }
+    })
 
     # Mapeo de expresiones a acciones de Moho
     EXPRESSION_ACTIONS = {
@@ -115,14 +246,82 @@ class MohoEngine(Engine):
         "excited": {"brows": 0.4, "eyes": 0.3, "mouth_curve": 0.6},
     }
 
-    def __init__(self) -> None:
-        self._temp_dir = Path(tempfile.mkdtemp(prefix="animatr_moho_"))
-        self._moho_path = self._find_moho()
+    # Expresiones pre-serializadas como tablas Lua (no cambian en runtime)
+    _EXPRESSION_LUA = {
+        name: (
+            "{\n"
+            f"    brows = {values['brows']},\n"
+            f"    eyes = {values['eyes']},\n"
+            f"    mouth_curve = {values['mouth_curve']},\n"
+            "}"
+        )
+        for name, values in EXPRESSION_ACTIONS.items()
+    }
+
+    # Análisis de energía: ventana de 40 ms (25 fps) y umbral relativo al pico
+    ENERGY_WINDOW = 0.04
+    ENERGY_THRESHOLD = 0.15
+
+    # Cache de _find_moho: (valor de MOHO_PATH, ejecutable encontrado)
+    _moho_path_cache: tuple[str | None, Path | None] | None = None
+
+    def __init__(self, temp_root: Path | None = None, lazy: bool = False) -> None:
+        """Inicializa el engine.
+
+        Args:
+            temp_root: Directorio de trabajo compartido (p. ej. en batch).
+                Pertenece al llamador y no se borra en ``cleanup()``. Si es
+                None se crea un directorio temporal propio.
+            lazy: Si es True, Moho no se busca hasta el primer ``process()``.
+                Útil para validar configuraciones sin tocar el disco.
+        """
+        if temp_root is not None:
+            temp_root.mkdir(parents=True, exist_ok=True)
+            self._temp_dir = temp_root
+            self._owns_temp_dir = False
+        else:
+            self._temp_dir = Path(tempfile.mkdtemp(prefix="animatr_moho_"))
+            self._owns_temp_dir = True
+            # Partial propio para poder desregistrar solo este directorio
+            self._atexit_cleanup = functools.partial(
+                shutil.rmtree, self._temp_dir, ignore_errors=True
+            )
+            atexit.register(self._atexit_cleanup)
+        self._lazy = lazy
+        self._moho_path = None if lazy else self._find_moho()
+
+    def cleanup(self) -> None:
+        """Limpia el directorio temporal propio del engine."""
+        if self._owns_temp_dir:
+            atexit.unregister(self._atexit_cleanup)
+            self._atexit_cleanup()
+
+    def __enter__(self) -> "MohoEngine":
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        """Context manager exit - limpia archivos temporales."""
+        self.cleanup()
 
     def _find_moho(self) -> Path | None:
-        """Encuentra el ejecutable de Moho Pro."""
-        # Buscar en variable de entorno primero
+        """Encuentra el ejecutable de Moho Pro.
+
+        El resultado se comparte entre instancias y solo se recalcula si
+        cambia MOHO_PATH, evitando repetir los stat() de cada ubicación.
+        """
         env_path = os.environ.get("MOHO_PATH")
+        cached = MohoEngine._moho_path_cache
+        if cached is not None and cached[0] == env_path:
+            return cached[1]
+
+        moho_path = self._scan_moho(env_path)
+        MohoEngine._moho_path_cache = (env_path, moho_path)
+        return moho_path
+
+    def _scan_moho(self, env_path: str | None) -> Path | None:
+        """Busca Moho Pro en MOHO_PATH y en las ubicaciones comunes."""
+        # Buscar en variable de entorno primero
         if env_path and Path(env_path).exists():
             return Path(env_path)
 
@@ -151,19 +350,23 @@ class MohoEngine(Engine):
 
     def process(self, config: MohoConfig) -> MohoResult:
         """Procesa una configuración de personaje y genera frames animados."""
+        if self._lazy:
+            self._moho_path = self._find_moho()
+            self._lazy = False
+
         if not self._moho_path:
             raise RuntimeError(
                 "Moho Pro no encontrado. Instala Moho Pro y configura MOHO_PATH."
             )
 
-        # Crear directorio para frames
         frames_dir = self._temp_dir / f"frames_{config.character.asset.replace('/', '_')}"
-        frames_dir.mkdir(exist_ok=True)
+        self._prepare_frames_dir(frames_dir)
 
-        # Extraer lip-sync si hay audio
+        # Extraer lip-sync si hay audio (el script Lua depende de él)
         lip_sync_data = None
-        if config.audio_path and config.audio_path.exists():
-            lip_sync_data = self._extract_lip_sync(config.audio_path)
+        audio_path = config.audio_path
+        if audio_path is not None and self._audio_size(audio_path) > 0:
+            lip_sync_data = self._extract_lip_sync(audio_path)
 
         # Generar script Lua para Moho
         lua_script = self._generate_lua_script(
@@ -188,7 +391,35 @@ class MohoEngine(Engine):
             # Fallback: generar frames placeholder
             self._generate_placeholder_frames(frames_dir, config)
 
-        frame_count = len(list(frames_dir.glob("*.png")))
+        return self._build_result(
+            config, frames_dir, lip_sync_applied=lip_sync_data is not None
+        )
+
+    @staticmethod
+    def _audio_size(audio_path: Path | None) -> int:
+        """Tamaño del audio con un único stat(); 0 si no existe."""
+        if audio_path is None:
+            return 0
+        try:
+            return audio_path.stat().st_size
+        except OSError:
+            return 0
+
+    def _prepare_frames_dir(self, frames_dir: Path) -> None:
+        """Crea el directorio de frames y descarta los de un render previo."""
+        frames_dir.mkdir(parents=True, exist_ok=True)
+        for stale in frames_dir.glob("*.png"):
+            stale.unlink(missing_ok=True)
+
+    def _build_result(
+        self,
+        config: MohoConfig,
+        frames_dir: Path,
+        lip_sync_applied: bool,
+    ) -> MohoResult:
+        """Construye el resultado contando los frames generados."""
+        with os.scandir(frames_dir) as entries:
+            frame_count = sum(1 for entry in entries if entry.name.endswith(".png"))
 
         return MohoResult(
             scene_id=f"moho_{config.character.asset}",
@@ -196,7 +427,7 @@ class MohoEngine(Engine):
             duration=config.duration,
             frames_dir=frames_dir,
             frame_count=frame_count,
-            lip_sync_applied=lip_sync_data is not None,
+            lip_sync_applied=lip_sync_applied,
             metadata={
                 "character": config.character.asset,
                 "expression": config.character.expression,
@@ -223,9 +454,9 @@ class MohoEngine(Engine):
         """
         try:
             # Intentar usar Rhubarb si está disponible
-            rhubarb_path = shutil.which("rhubarb")
+            rhubarb_path = _rhubarb_path()
             if rhubarb_path:
-                return self._extract_with_rhubarb(audio_path)
+                return self._extract_with_rhubarb(audio_path, rhubarb_path)
 
             # Fallback: análisis básico de energía
             return self._extract_basic_lip_sync(audio_path)
@@ -234,24 +465,31 @@ class MohoEngine(Engine):
             print(f"⚠️ Error extrayendo lip-sync: {e}")
             return None
 
-    def _extract_with_rhubarb(self, audio_path: Path) -> LipSyncData:
+    def _extract_with_rhubarb(
+        self, audio_path: Path, rhubarb_path: str = "rhubarb"
+    ) -> LipSyncData:
         """Usa Rhubarb Lip Sync para extraer fonemas precisos."""
-        output_path = self._temp_dir / "lip_sync.json"
-
+        # Sin -o Rhubarb escribe el JSON a stdout: se parsea desde el pipe
+        # sin archivo intermedio. El stream de progreso (stderr) se descarta
+        # en lugar de acumularlo en memoria.
         cmd = [
-            "rhubarb",
+            rhubarb_path,
             str(audio_path),
-            "-o", str(output_path),
             "-f", "json",
             "--machineReadable",
         ]
 
-        result = subprocess.run(cmd, capture_output=True, timeout=120)
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=120,
+        )
 
         if result.returncode != 0:
-            raise RuntimeError(f"Rhubarb falló: {result.stderr.decode()}")
+            raise RuntimeError(f"Rhubarb falló con código {result.returncode}")
 
-        data = json.loads(output_path.read_text())
+        data = json.loads(result.stdout)
 
         phonemes = []
         for cue in data.get("mouthCues", []):
@@ -267,31 +505,55 @@ class MohoEngine(Engine):
         )
 
     def _extract_basic_lip_sync(self, audio_path: Path) -> LipSyncData:
-        """Análisis básico de audio para lip-sync aproximado."""
-        # Usar FFmpeg para obtener volumen por frame
-        output_path = self._temp_dir / "volume.txt"
-
-        cmd = [
-            "ffmpeg",
-            "-i", str(audio_path),
-            "-af", "volumedetect",
-            "-f", "null",
-            "-",
-        ]
+        """Análisis básico de energía del audio para lip-sync aproximado.
 
-        result = subprocess.run(cmd, capture_output=True, timeout=60)
+        Con numpy y soundfile instalados (extra ``lipsync``) calcula el RMS
+        por ventana de 40 ms y abre o cierra la boca según la energía. Sin
+        ellos, o si el formato no es legible, usa una secuencia genérica.
+        """
+        try:
+            import numpy as np
+            import soundfile
+        except ImportError:
+            return self._extract_generic_lip_sync(audio_path)
 
-        # Obtener duración
-        probe_cmd = [
-            "ffprobe",
-            "-v", "quiet",
-            "-show_entries", "format=duration",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            str(audio_path),
+        try:
+            samples, sample_rate = soundfile.read(
+                audio_path, dtype="float32", always_2d=True
+            )
+        except RuntimeError:
+            return self._extract_generic_lip_sync(audio_path)
+
+        mono = samples.mean(axis=1)
+        hop = max(1, int(sample_rate * self.ENERGY_WINDOW))
+        windows = -(-len(mono) // hop)
+
+        # Una sola pasada vectorizada: rellenar a (ventanas, hop) y reducir
+        blocks = np.zeros(windows * hop, dtype=np.float32)
+        blocks[: len(mono)] = mono
+        rms = np.sqrt(np.square(blocks.reshape(windows, hop)).mean(axis=1))
+
+        threshold = max(float(rms.max(initial=0.0)) * self.ENERGY_THRESHOLD, 1e-4)
+        phonemes = [
+            {
+                "time": i * self.ENERGY_WINDOW,
+                "phoneme": "AA" if value > threshold else "SIL",
+                "duration": self.ENERGY_WINDOW,
+            }
+            for i, value in enumerate(rms.tolist())
         ]
 
-        duration_result = subprocess.run(probe_cmd, capture_output=True, timeout=30)
-        duration = float(duration_result.stdout.decode().strip() or "5.0")
+        return LipSyncData(
+            phonemes=phonemes,
+            duration=len(mono) / sample_rate,
+            sample_rate=sample_rate,
+        )
+
+    def _extract_generic_lip_sync(self, audio_path: Path) -> LipSyncData:
+        """Secuencia genérica de fonemas basada solo en la duración."""
+        # Duración leída del header del archivo, sin lanzar ffprobe
+        audio = mutagen.File(audio_path)
+        duration = audio.info.length if audio is not None else 5.0
 
         # Generar fonemas básicos basados en duración
         # En producción, esto debería ser análisis real de audio
@@ -326,150 +588,39 @@ class MohoEngine(Engine):
         """Genera el script Lua para controlar Moho."""
         total_frames = int(config.duration * config.fps)
 
-        # Convertir lip-sync a keyframes
+        # Convertir lip-sync a keyframes. Dentro de una racha del mismo viseme
+        # solo se emiten el primer y el último cue: los intermedios no cambian
+        # la curva de Moho y solo inflan la tabla LIP_SYNC.
         lip_sync_keyframes = ""
         if lip_sync_data:
-            for phoneme_data in lip_sync_data.phonemes:
-                frame = int(phoneme_data["time"] * config.fps)
-                viseme = self.PHONEME_TO_VISEME.get(
-                    phoneme_data["phoneme"], "mouth_rest"
-                )
-                lip_sync_keyframes += f'    {{frame = {frame}, viseme = "{viseme}"}},\n'
+            fps = config.fps
+            cues = lip_sync_data.phonemes
+            visemes = [_PHONEME_GET(cue["phoneme"], "mouth_rest") for cue in cues]
+            last = len(visemes) - 1
+            lip_sync_keyframes = "".join([
+                f'    {{frame = {int(cue["time"] * fps)}, viseme = "{viseme}"}},\n'
+                for i, (cue, viseme) in enumerate(zip(cues, visemes, strict=True))
+                if i in (0, last)
+                or viseme != visemes[i - 1]
+                or viseme != visemes[i + 1]
+            ])
 
         # Obtener datos de expresión
-        expression_data = self.EXPRESSION_ACTIONS.get(
-            config.character.expression, self.EXPRESSION_ACTIONS["neutral"]
+        expression_lua = self._EXPRESSION_LUA.get(
+            config.character.expression, self._EXPRESSION_LUA["neutral"]
         )
 
-        script = f'''-- ANIMATR Moho Animation Script
--- Auto-generated for: {config.character.asset}
-
--- Configuración
-local CONFIG = {{
-    output_dir = "{output_dir}",
-    total_frames = {total_frames},
-    fps = {config.fps},
-    width = {config.width},
-    height = {config.height},
-    expression = "{config.character.expression}",
-}}
-
--- Datos de expresión
-local EXPRESSION = {{
-    brows = {expression_data["brows"]},
-    eyes = {expression_data["eyes"]},
-    mouth_curve = {expression_data["mouth_curve"]},
-}}
-
--- Keyframes de lip-sync
-local LIP_SYNC = {{
-{lip_sync_keyframes}}}
-
--- Mapeo de visemes a valores de bone
-local VISEME_VALUES = {{
-    mouth_rest = 0,
-    mouth_closed = 0.1,
-    mouth_open = 0.8,
-    mouth_round = 0.6,
-    mouth_wide = 0.7,
-    mouth_smile = 0.5,
-    mouth_narrow = 0.3,
-    mouth_f = 0.4,
-    mouth_l = 0.35,
-    mouth_th = 0.45,
-}}
-
--- Función principal de animación
-function AnimateCharacter(moho)
-    local doc = moho.document
-    local layer = moho:LayerAsGroup(moho.layer)
-
-    if layer == nil then
-        print("Error: No se encontró el layer del personaje")
-        return
-    end
-
-    -- Aplicar expresión base
-    ApplyExpression(moho, layer, EXPRESSION)
-
-    -- Aplicar lip-sync frame por frame
-    for i, keyframe in ipairs(LIP_SYNC) do
-        local frame = keyframe.frame
-        local viseme = keyframe.viseme
-        local value = VISEME_VALUES[viseme] or 0
-
-        ApplyMouthShape(moho, layer, frame, value)
-    end
-
-    -- Renderizar frames
-    RenderFrames(moho, doc)
-end
-
-function ApplyExpression(moho, layer, expr)
-    -- Buscar bones de expresión
-    local skeleton = moho:LayerAsSkeleton(layer)
-    if skeleton == nil then return end
-
-    local skel = skeleton:Skeleton()
-    if skel == nil then return end
-
-    for i = 0, skel:CountBones() - 1 do
-        local bone = skel:Bone(i)
-        local name = bone:Name()
-
-        if string.find(name, "brow") then
-            -- Aplicar valor a cejas
-            local angle = expr.brows * 0.3
-            bone.fAngle:SetValue(0, angle)
-        elseif string.find(name, "eye") then
-            -- Aplicar valor a ojos
-            local scale = 1 + expr.eyes * 0.2
-            bone.fScale:SetValue(0, scale)
-        end
-    end
-end
-
-function ApplyMouthShape(moho, layer, frame, value)
-    local skeleton = moho:LayerAsSkeleton(layer)
-    if skeleton == nil then return end
-
-    local skel = skeleton:Skeleton()
-    if skel == nil then return end
-
-    for i = 0, skel:CountBones() - 1 do
-        local bone = skel:Bone(i)
-        local name = bone:Name()
-
-        if string.find(name:lower(), "mouth") or string.find(name:lower(), "jaw") then
-            -- Aplicar apertura de boca
-            local currentAngle = bone.fAngle:GetValue(0)
-            local targetAngle = currentAngle + (value * 0.5)
-            bone.fAngle:SetValue(frame, targetAngle)
-        end
-    end
-end
-
-function RenderFrames(moho, doc)
-    local renderSettings = doc:RenderSettings()
-
-    renderSettings.fFormat = MOHO.RIF_PNG
-    renderSettings.fWidth = CONFIG.width
-    renderSettings.fHeight = CONFIG.height
-    renderSettings.fStartFrame = 0
-    renderSettings.fEndFrame = CONFIG.total_frames - 1
-    renderSettings.fFrameRate = CONFIG.fps
-
-    for frame = 0, CONFIG.total_frames - 1 do
-        local filename = string.format("%s/frame_%05d.png", CONFIG.output_dir, frame)
-        doc:RenderFrame(frame, filename, renderSettings)
-    end
-end
-
--- Ejecutar
-AnimateCharacter(moho)
-print("Animación completada: " .. CONFIG.total_frames .. " frames")
-'''
-        return script
+        return _LUA_TEMPLATE.substitute(
+            asset=config.character.asset,
+            output_dir=_lua_escape(str(output_dir)),
+            total_frames=total_frames,
+            fps=config.fps,
+            width=config.width,
+            height=config.height,
+            expression=_lua_escape(config.character.expression),
+            expression_lua=expression_lua,
+            lip_sync_keyframes=lip_sync_keyframes,
+        ) + _LUA_STATIC_BODY
 
     def _run_moho(
         self,
@@ -519,36 +670,69 @@ print("Animación completada: " .. CONFIG.total_frames .. " frames")
     ) -> None:
         """Genera frames placeholder cuando Moho no está disponible."""
         try:
-            total_frames = int(config.duration * config.fps)
-
-            # Usar FFmpeg para generar frames de color sólido con texto
-            for i in range(min(total_frames, 300)):  # Limitar a 300 frames
-                output_path = output_dir / f"frame_{i:05d}.png"
-
-                # Color basado en posición del personaje
-                colors = {
-                    "left": "0x3498db",
-                    "center": "0x2ecc71",
-                    "right": "0xe74c3c",
-                }
-                color = colors.get(config.character.position, "0x9b59b6")
-
-                cmd = [
+            # Limitar a 300 frames
+            frame_count = min(int(config.duration * config.fps), 300)
+            if frame_count <= 0:
+                return
+
+            # Color basado en posición del personaje
+            colors = {
+                "left": "0x3498db",
+                "center": "0x2ecc71",
+                "right": "0xe74c3c",
+            }
+            color = colors.get(config.character.position, "0x9b59b6")
+
+            # Cada invocación de FFmpeg emite un tramo contiguo de la
+            # secuencia PNG (drawtext numera con n + inicio del tramo). Los
+            # tramos corren en paralelo: el encoder PNG usa un solo core.
+            workers = max(1, min(os.cpu_count() or 1, frame_count // 30))
+            chunk = -(-frame_count // workers)
+
+            color_source = (
+                f"color=c={color}:s={config.width}x{config.height}:r={config.fps}"
+            )
+            cmds = []
+            for start in range(0, frame_count, chunk):
+                length = min(chunk, frame_count - start)
+                drawtext = (
+                    f"drawtext=text='Frame %{{eif\\:n+{start}\\:d}}"
+                    f" - {config.character.expression}'"
+                    ":fontsize=48:fontcolor=white"
+                    ":x=(w-text_w)/2:y=(h-text_h)/2"
+                )
+                cmds.append([
                     "ffmpeg",
+                    "-nostdin", "-loglevel", "error",
                     "-y",
                     "-f", "lavfi",
-                    "-i", f"color=c={color}:s={config.width}x{config.height}:d=0.04",
-                    "-vframes", "1",
-                    "-vf", f"drawtext=text='Frame {i} - {config.character.expression}':fontsize=48:fontcolor=white:x=(w-text_w)/2:y=(h-text_h)/2",
-                    str(output_path),
-                ]
-
-                subprocess.run(cmd, capture_output=True, timeout=10)
+                    "-i", color_source,
+                    "-frames:v", str(length),
+                    "-vf", drawtext,
+                    "-start_number", str(start),
+                    str(output_dir / "frame_%05d.png"),
+                ])
+
+            # Los hilos solo esperan a los subprocesos, el GIL no limita
+            with ThreadPoolExecutor(max_workers=len(cmds)) as pool:
+                list(pool.map(
+                    lambda cmd: subprocess.run(
+                        cmd,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        timeout=10 + chunk * 0.1,
+                    ),
+                    cmds,
+                ))
 
         except Exception as e:
             print(f"⚠️ Error generando placeholders: {e}")
 
 
+# Lookup ligado una vez: evita resolver self → clase → dict por fonema
+_PHONEME_GET = MohoEngine.PHONEME_TO_VISEME.get
+
+
 class MohoAssetManager:
     """Gestiona assets de Moho (personajes, props, backgrounds)."""
 
@@ -557,12 +741,12 @@ class MohoAssetManager:
 
     def list_characters(self) -> list[dict[str, Any]]:
         """Lista todos los personajes disponibles."""
-        characters = []
+        characters: list[dict[str, Any]] = []
 
         if not self.assets_dir.exists():
             return characters
 
-        for path in self.assets_dir.glob("**/*.moho"):
+        for path in self._walk_moho_files(self.assets_dir):
             characters.append({
                 "name": path.stem,
                 "path": str(path),
@@ -571,6 +755,19 @@ class MohoAssetManager:
 
         return characters
 
+    @classmethod
+    def _walk_moho_files(cls, directory: Path) -> Iterator[Path]:
+        """Recorre el árbol con os.scandir usando el tipo cacheado del dirent."""
+        with os.scandir(directory) as entries:
+            subdirs = []
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".moho"):
+                    yield Path(entry.path)
+        for subdir in subdirs:
+            yield from cls._walk_moho_files(Path(subdir))
+
     def get_character_info(self, asset_path: str) -> dict[str, Any] | None:
         """Obtiene información sobre un personaje."""
         path = Path(asset_path)
@@ -7,9 +7,18 @@ Este módulo orquesta el pipeline completo de renderizado:
 4. FFmpeg → Ensambla video final
 """
 
+import collections
+import hashlib
+import itertools
+import json
 import logging
+import os
+import shutil
 import subprocess
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Callable
@@ -18,12 +27,53 @@ from animatr.db.manager import ProjectManager
 from animatr.db.models import RenderStatus
 from animatr.engines.audio import AudioEngine
 from animatr.engines.base import EngineResult
-from animatr.engines.blender import BlenderEngine, BlenderSceneConfig
+from animatr.engines.blender import (
+    DEFAULT_RENDER_CACHE_DIR,
+    BlenderEngine,
+    BlenderSceneConfig,
+)
+from animatr.engines.ffmpeg import h264_codec_args
 from animatr.engines.moho import MohoConfig, MohoEngine
-from animatr.schema import AnimationSpec, Scene
+from animatr.schema import (
+    DEFAULT_BACKGROUND_COLOR,
+    AnimationSpec,
+    AudioConfig,
+    Background,
+    Scene,
+)
 
 logger = logging.getLogger(__name__)
 
+# Cache persistente de TTS compartido entre renders (CLI y SDK)
+DEFAULT_TTS_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "animatr"
+    / "tts"
+)
+
+# Espacio mínimo libre para usar /dev/shm como scratch de frames
+SCRATCH_MIN_FREE = 4 * 1024**3
+
+
+def _scratch_root() -> str | None:
+    """Directorio base para archivos intermedios del render.
+
+    Usa ANIMATR_TMP si está definido; si no, /dev/shm (RAM) cuando existe
+    y tiene al menos SCRATCH_MIN_FREE libres. None deja el default de
+    tempfile (TMPDIR o /tmp).
+    """
+    env_root = os.environ.get("ANIMATR_TMP")
+    if env_root:
+        return env_root
+
+    shm = Path("/dev/shm")
+    try:
+        if shm.is_dir() and shutil.disk_usage(shm).free >= SCRATCH_MIN_FREE:
+            return str(shm)
+    except OSError:
+        pass
+    return None
+
 
 @dataclass
 class RenderProgress:
@@ -57,6 +107,49 @@ class RenderProgress:
             self.progress = base_progress + phase_progress
 
 
+def _run_ffmpeg(cmd: list[str], tail_lines: int = 200) -> None:
+    """Ejecuta FFmpeg leyendo stderr en streaming.
+
+    Solo se conservan las últimas ``tail_lines`` líneas (para el error),
+    así la memoria no crece con la longitud del log.
+
+    Raises:
+        subprocess.CalledProcessError: Si FFmpeg termina con error
+    """
+    process = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        bufsize=1,
+    )
+    tail: collections.deque[str] = collections.deque(maxlen=tail_lines)
+    assert process.stderr is not None
+    with process.stderr:
+        for line in process.stderr:
+            tail.append(line)
+            logger.debug(line.rstrip())
+
+    returncode = process.wait()
+    if returncode != 0:
+        stderr = "".join(tail)
+        logger.error(f"FFmpeg error: {stderr}")
+        raise subprocess.CalledProcessError(returncode, cmd, "", stderr)
+
+
+def _write_concat_list(concat_file: Path, videos: list[Path]) -> None:
+    """Escribe la lista del concat demuxer de FFmpeg en una sola escritura.
+
+    Las comillas simples se escapan (``'\\''``) para que un path con
+    apóstrofes no rompa el parseo de la lista.
+    """
+    lines = [
+        "file '{}'\n".format(str(video).replace("'", "'\\''")) for video in videos
+    ]
+    concat_file.write_text("".join(lines))
+
+
 class Orchestrator:
     """Coordina la ejecución de engines para renderizar un video completo.
 
@@ -64,17 +157,23 @@ class Orchestrator:
         Scene → Audio Engine → Moho Engine → Blender Engine → FFmpeg
 
     El orchestrator gestiona:
-    - Ejecución secuencial de engines por escena
+    - Ejecución de escenas en paralelo (engines secuenciales por escena)
     - Paso de resultados entre engines
     - Composición final del video
     - Tracking de progreso
     """
 
+    # Peticiones TTS simultáneas (limitadas por red y rate limit del provider)
+    AUDIO_PREFETCH_WORKERS = 4
+
     def __init__(
         self,
         spec: AnimationSpec,
         project_manager: ProjectManager | None = None,
         render_job_id: int | None = None,
+        max_workers: int | None = None,
+        tts_cache_dir: Path | None = None,
+        render_cache_dir: Path | None = None,
     ) -> None:
         """Inicializa el orchestrator.
 
@@ -82,18 +181,34 @@ class Orchestrator:
             spec: AnimationSpec con la definición del video
             project_manager: Gestor de proyectos para persistencia
             render_job_id: ID del job de render para tracking
+            max_workers: Escenas procesadas en paralelo. Por defecto
+                min(escenas, CPUs)
+            tts_cache_dir: Directorio de cache de audio TTS por contenido.
+                Si es None no se cachea (ver DEFAULT_TTS_CACHE_DIR)
+            render_cache_dir: Directorio de cache de renders de Blender.
+                Si es None no se cachea (ver DEFAULT_RENDER_CACHE_DIR)
         """
         self.spec = spec
         self.project_manager = project_manager
         self.render_job_id = render_job_id
+        self.tts_cache_dir = tts_cache_dir
+        self.render_cache_dir = render_cache_dir
+        self.max_workers = max_workers or max(
+            1, min(len(spec.scenes), os.cpu_count() or 1)
+        )
 
-        # Engines
-        self.audio_engine = AudioEngine()
-        self.moho_engine = MohoEngine()
-        self.blender_engine = BlenderEngine()
+        # Engines: se construyen al primer uso (ver propiedades abajo)
+        self._engine_lock = threading.Lock()
+        self._audio_engine: AudioEngine | None = None
+        self._moho_engine: MohoEngine | None = None
+        self._blender_engine: BlenderEngine | None = None
+        self._needs_moho = any(scene.character for scene in spec.scenes)
 
         # Working directories
-        self._temp_dir = Path(tempfile.mkdtemp(prefix="animatr_render_"))
+        # Frames y segmentos intermedios en RAM si es posible
+        self._temp_dir = Path(
+            tempfile.mkdtemp(prefix="animatr_render_", dir=_scratch_root())
+        )
         self._audio_dir = self._temp_dir / "audio"
         self._moho_dir = self._temp_dir / "moho"
         self._blender_dir = self._temp_dir / "blender"
@@ -102,14 +217,67 @@ class Orchestrator:
         for d in [self._audio_dir, self._moho_dir, self._blender_dir, self._output_dir]:
             d.mkdir(parents=True, exist_ok=True)
 
-        # Progress tracking
+        # Progress tracking (compartido entre workers, protegido por lock)
         self.progress = RenderProgress(total_scenes=len(spec.scenes))
         self._progress_callbacks: list[Callable[[RenderProgress], None]] = []
+        self._progress_lock = threading.Lock()
+        self._last_flush_time = 0.0
+        self._last_flush_progress = -1.0
+
+        # Estado por hilo worker: id y MohoEngine con directorio propio
+        self._worker = threading.local()
+        self._worker_ids = itertools.count()
+
+    # Los engines se crean al primer uso, que puede ocurrir a la vez en
+    # varios workers: el lock evita construir (y dejar huérfano) un segundo
+    # engine con su propio directorio temporal
+
+    @property
+    def audio_engine(self) -> AudioEngine:
+        """Engine de TTS, creado solo si alguna escena tiene audio."""
+        with self._engine_lock:
+            if self._audio_engine is None:
+                self._audio_engine = AudioEngine()
+            return self._audio_engine
+
+    @property
+    def moho_engine(self) -> MohoEngine:
+        """Engine de Moho, creado solo si alguna escena tiene personaje."""
+        with self._engine_lock:
+            if self._moho_engine is None:
+                self._moho_engine = MohoEngine(lazy=True)
+            return self._moho_engine
+
+    @property
+    def blender_engine(self) -> BlenderEngine:
+        """Engine de composición con Blender."""
+        with self._engine_lock:
+            if self._blender_engine is None:
+                self._blender_engine = BlenderEngine(
+                    cache_dir=self.render_cache_dir
+                )
+            return self._blender_engine
 
     def on_progress(self, callback: Callable[[RenderProgress], None]) -> None:
         """Registra un callback para actualizaciones de progreso."""
         self._progress_callbacks.append(callback)
 
+    def _init_worker(self) -> None:
+        """Inicializa el estado de un hilo worker del pool de escenas."""
+        worker_id = next(self._worker_ids)
+        self._worker.id = worker_id
+        # Moho escribe animate.lua y frames en su temp_dir: uno por worker
+        if self._needs_moho:
+            self._worker.moho_engine = MohoEngine(
+                temp_root=self._moho_dir / f"worker_{worker_id}", lazy=True
+            )
+
+    def _update_phase(self, scene_id: str, phase: str) -> None:
+        """Actualiza la fase de una escena y notifica."""
+        with self._progress_lock:
+            self.progress.update(scene_id, phase)
+            self._notify_progress()
+
     def _notify_progress(self) -> None:
         """Notifica a todos los callbacks registrados."""
         for callback in self._progress_callbacks:
@@ -118,14 +286,24 @@ class Orchestrator:
             except Exception as e:
                 logger.warning(f"Progress callback error: {e}")
 
-        # Actualizar en base de datos si disponible
+        # Actualizar en base de datos si disponible, como mucho cada 250 ms
+        # salvo que el progreso avance >1%. Los estados finales
+        # (COMPLETED/FAILED) se escriben siempre en render()
         if self.project_manager and self.render_job_id:
-            self.project_manager.update_render_job(
-                self.render_job_id,
-                progress=self.progress.progress,
-                current_scene=self.progress.current_scene,
-                completed_scenes=self.progress.completed_scenes,
-            )
+            progress = self.progress
+            now = time.monotonic()
+            if (
+                now - self._last_flush_time >= 0.25
+                or progress.progress - self._last_flush_progress > 0.01
+            ):
+                self.project_manager.update_render_job(
+                    self.render_job_id,
+                    progress=progress.progress,
+                    current_scene=progress.current_scene,
+                    completed_scenes=progress.completed_scenes,
+                )
+                self._last_flush_time = now
+                self._last_flush_progress = progress.progress
 
     def render(self, output_path: Path) -> Path:
         """Renderiza el spec completo a un video.
@@ -153,22 +331,59 @@ class Orchestrator:
                 total_scenes=len(self.spec.scenes),
             )
 
-        scene_results: list[dict[str, Any]] = []
-
         try:
-            for scene in self.spec.scenes:
-                self.progress.update(scene.id, "processing")
-                self._notify_progress()
-
-                result = self._process_scene(scene)
-                scene_results.append(result)
-
-                self.progress.completed_scenes += 1
-                self._notify_progress()
+            # Las escenas son independientes: se procesan en paralelo y el
+            # trabajo pesado (TTS, Moho, Blender) ocurre en subprocesos o red.
+            # El TTS de todas las escenas se pide por adelantado en su propio
+            # pool para que la latencia de red quede oculta tras Moho/Blender.
+            # Escenas idénticas (salvo el id) se procesan una sola vez
+            with ThreadPoolExecutor(
+                max_workers=self.AUDIO_PREFETCH_WORKERS,
+            ) as audio_pool, ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=self._init_worker,
+            ) as pool:
+                unique: dict[str, Future[dict[str, Any]]] = {}
+                audio_futures: list[Future[tuple[Path, float]]] = []
+                futures: list[Future[dict[str, Any]]] = []
+                for scene in self.spec.scenes:
+                    key = self._scene_key(scene)
+                    if key not in unique:
+                        audio_future = None
+                        if scene.audio:
+                            audio_future = audio_pool.submit(
+                                self._synthesize_audio, scene.audio, scene.id
+                            )
+                            audio_futures.append(audio_future)
+                        unique[key] = pool.submit(
+                            self._process_scene, scene, audio_future
+                        )
+                    futures.append(unique[key])
+                copies = collections.Counter(futures)
+
+                try:
+                    for future in as_completed(unique.values()):
+                        future.result()
+                        with self._progress_lock:
+                            self.progress.completed_scenes += copies[future]
+                            self._notify_progress()
+                except BaseException:
+                    pending: list[Future[Any]] = [*unique.values(), *audio_futures]
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+            # Resultados en el orden original de las escenas; los duplicados
+            # comparten el video de la primera aparición
+            scene_results: list[dict[str, Any]] = [
+                {**future.result(), "scene_id": scene.id}
+                for scene, future in zip(self.spec.scenes, futures, strict=True)
+            ]
 
             # Componer video final
-            self.progress.current_phase = "compose"
-            self._notify_progress()
+            with self._progress_lock:
+                self.progress.current_phase = "compose"
+                self._notify_progress()
 
             final_path = self._compose_video(scene_results, output_path)
 
@@ -178,6 +393,7 @@ class Orchestrator:
                     self.render_job_id,
                     status=RenderStatus.COMPLETED,
                     progress=1.0,
+                    completed_scenes=self.progress.completed_scenes,
                     output_path=str(final_path),
                 )
 
@@ -197,7 +413,18 @@ class Orchestrator:
 
             raise
 
-    def _process_scene(self, scene: Scene) -> dict[str, Any]:
+    def _scene_key(self, scene: Scene) -> str:
+        """Clave de contenido de una escena (todo menos el id)."""
+        data = scene.model_dump(mode="json", exclude={"id"})
+        return hashlib.sha256(
+            json.dumps(data, sort_keys=True).encode()
+        ).hexdigest()
+
+    def _process_scene(
+        self,
+        scene: Scene,
+        audio_future: "Future[tuple[Path, float]] | None" = None,
+    ) -> dict[str, Any]:
         """Procesa una escena individual a través del pipeline.
 
         Pipeline por escena:
@@ -207,6 +434,7 @@ class Orchestrator:
 
         Args:
             scene: Scene a procesar
+            audio_future: TTS ya lanzado en el pool de prefetch, si existe
 
         Returns:
             Dict con resultados de cada engine
@@ -219,19 +447,17 @@ class Orchestrator:
         }
 
         logger.info(f"Processing scene: {scene_id}")
+        worker_id = getattr(self._worker, "id", 0)
 
         # ==== PHASE 1: AUDIO ====
-        self.progress.update(scene_id, "audio")
-        self._notify_progress()
+        self._update_phase(scene_id, "audio")
 
         audio_path: Path | None = None
         if scene.audio:
-            audio_result = self.audio_engine.process(
-                scene.audio,
-                scene_id=scene_id,
-            )
-            audio_path = audio_result.output_path
-            duration = audio_result.duration
+            if audio_future is not None:
+                audio_path, duration = audio_future.result()
+            else:
+                audio_path, duration = self._synthesize_audio(scene.audio, scene_id)
             results["audio"] = {
                 "path": str(audio_path) if audio_path else None,
                 "duration": duration,
@@ -239,38 +465,37 @@ class Orchestrator:
             logger.debug(f"Audio generated: {audio_path} ({duration}s)")
 
         # ==== PHASE 2: MOHO (Character Animation) ====
-        self.progress.update(scene_id, "moho")
-        self._notify_progress()
+        self._update_phase(scene_id, "moho")
 
         moho_frames_dir: Path | None = None
         if scene.character and audio_path:
             moho_config = MohoConfig(
-                scene_id=scene_id,
                 character=scene.character,
                 audio_path=audio_path,
-                output_dir=self._moho_dir / scene_id,
                 duration=duration,
-                expression=scene.character.expression,
                 fps=self.spec.output.fps,
+                width=self.spec.output.width,
+                height=self.spec.output.height,
             )
 
-            moho_result = self.moho_engine.process(moho_config)
+            moho_engine = getattr(self._worker, "moho_engine", None) or self.moho_engine
+            moho_result = moho_engine.process(moho_config)
             moho_frames_dir = moho_result.output_path
             results["moho"] = {
                 "frames_dir": str(moho_frames_dir) if moho_frames_dir else None,
-                "lip_sync": moho_result.metadata.get("lip_sync_frames") if moho_result.metadata else 0,
+                "lip_sync": moho_result.lip_sync_applied,
             }
             logger.debug(f"Moho animation: {moho_frames_dir}")
 
         # ==== PHASE 3: BLENDER (Scene Composition) ====
-        self.progress.update(scene_id, "blender")
-        self._notify_progress()
+        self._update_phase(scene_id, "blender")
 
-        # Determinar color de fondo
-        background_color = "#1E3A5F"  # Default
-        if scene.background:
-            if scene.background.color:
-                background_color = scene.background.color
+        # Determinar fondo (color por defecto si la escena no define uno)
+        background = scene.background or Background()
+        if not background.color:
+            background = background.model_copy(
+                update={"color": DEFAULT_BACKGROUND_COLOR}
+            )
 
         # Determinar posición de personaje
         character_position = "center"
@@ -279,15 +504,16 @@ class Orchestrator:
 
         blender_config = BlenderSceneConfig(
             scene_id=scene_id,
-            output_dir=self._blender_dir / scene_id,
-            resolution=(self.spec.output.width, self.spec.output.height),
-            fps=self.spec.output.fps,
             duration=duration,
-            background_color=background_color,
-            background_image=scene.background.image if scene.background else None,
-            moho_frames_dir=moho_frames_dir,
-            audio_path=audio_path,
+            width=self.spec.output.width,
+            height=self.spec.output.height,
+            fps=self.spec.output.fps,
+            background=background,
+            character_frames_dir=moho_frames_dir,
             character_position=character_position,
+            audio_path=audio_path,
+            container=self.spec.output.format,
+            worker_id=worker_id,
         )
 
         blender_result = self.blender_engine.process(blender_config)
@@ -299,6 +525,67 @@ class Orchestrator:
 
         return results
 
+    def _synthesize_audio(
+        self,
+        audio: AudioConfig,
+        scene_id: str,
+    ) -> tuple[Path, float]:
+        """Genera el audio TTS de una escena, reutilizando el cache si existe.
+
+        La clave es el SHA-256 de texto normalizado, voz, provider y
+        velocidad, así que el mismo texto no se vuelve a pedir al provider.
+
+        Args:
+            audio: Configuración de audio de la escena
+            scene_id: ID de la escena
+
+        Returns:
+            Tupla (path al audio, duración en segundos)
+        """
+        if self.tts_cache_dir is None:
+            return self._generate_tts(audio, scene_id)
+
+        text = " ".join(audio.text.split())
+        key = hashlib.sha256(
+            f"{text}|{audio.voice}|{audio.provider}|{audio.speed}".encode()
+        ).hexdigest()
+        cached_path = self.tts_cache_dir / f"{key}.mp3"
+        meta_path = cached_path.with_suffix(".json")
+
+        # El JSON se escribe después del mp3: si existe, el audio está completo
+        try:
+            duration = json.loads(meta_path.read_text())["duration"]
+            if cached_path.exists():
+                logger.debug(f"TTS cache hit for {scene_id}: {cached_path}")
+                return cached_path, duration
+        except (OSError, ValueError, KeyError):
+            pass
+
+        audio_path, duration = self._generate_tts(audio, scene_id)
+
+        # Escritura atómica: varios workers pueden generar la misma clave
+        self.tts_cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_suffix = f".{os.getpid()}_{threading.get_ident()}.tmp"
+        tmp_audio = cached_path.with_suffix(tmp_suffix)
+        shutil.copyfile(audio_path, tmp_audio)
+        os.replace(tmp_audio, cached_path)
+        tmp_meta = meta_path.with_suffix(tmp_suffix)
+        tmp_meta.write_text(json.dumps({"duration": duration}))
+        os.replace(tmp_meta, meta_path)
+
+        return cached_path, duration
+
+    def _generate_tts(self, audio: AudioConfig, scene_id: str) -> tuple[Path, float]:
+        """Pide el audio al AudioEngine.
+
+        Raises:
+            RuntimeError: Si el engine no devuelve ningún archivo
+        """
+        result = self.audio_engine.process(audio)
+        if result.output_path is None:
+            raise RuntimeError(f"El TTS no generó audio para la escena {scene_id}")
+        return result.output_path, result.duration
+
     def _compose_video(
         self,
         scene_results: list[dict[str, Any]],
@@ -332,43 +619,145 @@ class Orchestrator:
             logger.warning("No valid scene videos, creating fallback")
             return self._create_fallback_video(scene_results, output_path)
 
+        if len(valid_videos) == 1:
+            # Una sola escena: no hay nada que concatenar
+            return self._link_or_copy(Path(valid_videos[0]), output_path)
+
         # Crear archivo de concatenación
         concat_file = self._temp_dir / "concat.txt"
-        with open(concat_file, "w") as f:
-            for video_path in valid_videos:
-                f.write(f"file '{video_path}'\n")
+        _write_concat_list(concat_file, valid_videos)
 
         # Concatenar con FFmpeg
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        if self._can_stream_copy(valid_videos):
+            # Mismo codec/resolución/fps: solo se remuxan los paquetes
+            codec_args = ["-c", "copy"]
+        else:
+            logger.warning("Scene streams differ, re-encoding final video")
+            codec_args = [
+                *h264_codec_args(),
+                "-c:a", "aac",
+                "-b:a", "192k",
+                "-r", str(fps),
+            ]
+
         cmd = [
             "ffmpeg",
+            "-nostdin", "-loglevel", "error",
             "-y",
             "-f", "concat",
             "-safe", "0",
             "-i", str(concat_file),
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
-            "-c:a", "aac",
-            "-b:a", "192k",
-            "-r", str(fps),
+            *codec_args,
             "-movflags", "+faststart",
             str(output_path),
         ]
 
         logger.info(f"Composing final video with FFmpeg")
-        result = subprocess.run(cmd, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            logger.error(f"FFmpeg error: {result.stderr}")
-            raise subprocess.CalledProcessError(
-                result.returncode,
-                cmd,
-                result.stdout,
-                result.stderr,
+        _run_ffmpeg(cmd)
+
+        return output_path
+
+    def _probe_streams(self, video: str) -> list[dict[str, Any]] | None:
+        """Lee los streams de un video con ffprobe (None si falla)."""
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe", "-v", "error",
+                    "-show_streams", "-of", "json",
+                    video,
+                ],
+                capture_output=True,
+                text=True,
+                timeout=30,
             )
+            return json.loads(result.stdout).get("streams", [])
+        except (OSError, subprocess.SubprocessError, ValueError):
+            return None
+
+    def _can_stream_copy(self, videos: list[Path]) -> bool:
+        """Verifica si las escenas pueden concatenarse sin re-encode.
+
+        Requiere el codec del contenedor de salida (H.264, o VP9 en webm)
+        con la resolución y fps del OutputConfig en todas las escenas, y el
+        mismo SAR, pix_fmt y audio (codec, sample rate y layout, o ninguno).
+        Los videos se analizan en paralelo, una vez por archivo.
+        """
+        output_config = self.spec.output
+        video_codec, audio_codec = (
+            ("vp9", "opus") if output_config.format == "webm" else ("h264", "aac")
+        )
+        expected_video = (
+            video_codec, output_config.width, output_config.height, output_config.fps
+        )
+
+        unique_videos = list(dict.fromkeys(str(video) for video in videos))
+        with ThreadPoolExecutor(max_workers=min(8, len(unique_videos))) as pool:
+            probes = list(pool.map(self._probe_streams, unique_videos))
 
+        signatures = set()
+        for streams in probes:
+            if streams is None:
+                return False
+
+            video_streams = [st for st in streams if st.get("codec_type") == "video"]
+            audio_streams = [st for st in streams if st.get("codec_type") == "audio"]
+            if len(video_streams) != 1 or len(audio_streams) > 1:
+                return False
+
+            stream = video_streams[0]
+            num, _, den = stream.get("avg_frame_rate", "0/0").partition("/")
+            try:
+                stream_fps = round(int(num) / int(den))
+            except (ValueError, ZeroDivisionError):
+                return False
+            if (
+                stream.get("codec_name"),
+                stream.get("width"),
+                stream.get("height"),
+                stream_fps,
+            ) != expected_video:
+                return False
+
+            audio = tuple(
+                (st.get("codec_name"), st.get("sample_rate"), st.get("channel_layout"))
+                for st in audio_streams
+            )
+            if any(codec != audio_codec for codec, _, _ in audio):
+                return False
+
+            signatures.add((
+                stream.get("sample_aspect_ratio", "1:1"),
+                stream.get("pix_fmt"),
+                audio,
+            ))
+
+        return len(signatures) == 1
+
+    def _link_or_copy(self, source: Path, output_path: Path) -> Path:
+        """Coloca un video en output_path con un hardlink o, si no, copiándolo.
+
+        Las entradas del cache de renders siempre se copian: con un hardlink,
+        editar el video final en el sitio corrompería el cache.
+
+        Args:
+            source: Video ya generado
+            output_path: Path destino
+
+        Returns:
+            Path al video final
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.unlink(missing_ok=True)
+        if self.render_cache_dir and source.is_relative_to(self.render_cache_dir):
+            shutil.copy2(source, output_path)
+            return output_path
+        try:
+            os.link(source, output_path)
+        except OSError:
+            # Otro filesystem o sin soporte de hardlinks
+            shutil.copy2(source, output_path)
         return output_path
 
     def _create_fallback_video(
@@ -387,75 +776,107 @@ class Orchestrator:
         Returns:
             Path al video generado
         """
-        output_config = self.spec.output
-        width = output_config.width
-        height = output_config.height
-        fps = output_config.fps
+        color_source = self.spec.output.color_source
+        fps = self.spec.output.fps
+        default_color = DEFAULT_BACKGROUND_COLOR.replace("#", "0x")
 
         segments: list[Path] = []
+        segments_with_audio: set[bool] = set()
+        cmds: list[list[str]] = []
 
-        for i, (result, scene) in enumerate(zip(scene_results, self.spec.scenes)):
+        pairs = zip(scene_results, self.spec.scenes, strict=True)
+        for i, (result, scene) in enumerate(pairs):
             duration = result["duration"]
             audio_path = result.get("audio", {}).get("path")
 
             # Color de fondo
-            bg_color = "0x1E3A5F"
-            if scene.background and scene.background.color:
-                bg_color = scene.background.color.replace("#", "0x")
+            bg_color = (
+                scene.background.ffmpeg_color if scene.background else default_color
+            )
+            source = f"{color_source.format(color=bg_color)}:d={duration}"
+
+            # Color sólido: todos los frames son iguales, así que se salta la
+            # búsqueda de movimiento y basta un único keyframe por segmento
+            still_x264 = [
+                "-c:v", "libx264", "-threads", "1",
+                "-preset", "ultrafast",
+                "-tune", "stillimage",
+                "-g", str(max(1, int(fps * duration))),
+                "-x264-params", "scenecut=0",
+                "-pix_fmt", "yuv420p",
+            ]
 
             segment_path = self._output_dir / f"segment_{i}.mp4"
 
-            if audio_path and Path(audio_path).exists():
+            has_audio = bool(audio_path and Path(audio_path).exists())
+            segments_with_audio.add(has_audio)
+            if has_audio:
                 cmd = [
-                    "ffmpeg", "-y",
+                    "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
                     "-f", "lavfi",
-                    "-i", f"color=c={bg_color}:s={width}x{height}:r={fps}:d={duration}",
+                    "-i", source,
                     "-i", audio_path,
-                    "-c:v", "libx264",
+                    *still_x264,
                     "-c:a", "aac",
                     "-shortest",
                     str(segment_path),
                 ]
             else:
                 cmd = [
-                    "ffmpeg", "-y",
+                    "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
                     "-f", "lavfi",
-                    "-i", f"color=c={bg_color}:s={width}x{height}:r={fps}:d={duration}",
-                    "-c:v", "libx264",
+                    "-i", source,
+                    *still_x264,
                     "-an",
                     str(segment_path),
                 ]
 
-            subprocess.run(cmd, capture_output=True, check=True)
+            cmds.append(cmd)
             segments.append(segment_path)
 
+        # Un FFmpeg de un hilo por segmento, tantos en paralelo como CPUs
+        if cmds:
+            workers = min(len(cmds), os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_run_ffmpeg, cmds))
+
         # Concatenar segmentos
+        if len(segments) == 1:
+            return self._link_or_copy(segments[0], output_path)
+
         if segments:
             concat_file = self._temp_dir / "fallback_concat.txt"
-            with open(concat_file, "w") as f:
-                for seg in segments:
-                    f.write(f"file '{seg}'\n")
+            _write_concat_list(concat_file, segments)
 
             output_path.parent.mkdir(parents=True, exist_ok=True)
 
+            # Los segmentos comparten parámetros de encode: basta con remuxar
+            # salvo que mezclen segmentos con y sin audio
+            if len(segments_with_audio) == 1:
+                codec_args = ["-c", "copy"]
+            else:
+                codec_args = [*h264_codec_args(), "-c:a", "aac"]
+
             cmd = [
-                "ffmpeg", "-y",
+                "ffmpeg", "-nostdin", "-loglevel", "error", "-y",
+                "-fflags", "+genpts",
                 "-f", "concat",
                 "-safe", "0",
                 "-i", str(concat_file),
-                "-c:v", "libx264",
-                "-c:a", "aac",
+                *codec_args,
+                "-avoid_negative_ts", "make_zero",
                 str(output_path),
             ]
 
-            subprocess.run(cmd, capture_output=True, check=True)
+            _run_ffmpeg(cmd)
 
         return output_path
 
     def cleanup(self) -> None:
-        """Limpia archivos temporales."""
-        import shutil
+        """Limpia archivos temporales.
 
+        Si el scratch está en /dev/shm esto libera RAM, no solo disco.
+        """
         if self._temp_dir.exists():
             shutil.rmtree(self._temp_dir)
             logger.debug(f"Cleaned up temp directory: {self._temp_dir}")
@@ -8,6 +8,16 @@ import re
 import yaml
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    # Loader/Dumper en C (libyaml): bastante más rápidos para specs grandes
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
+_RESOLUTION_RE = re.compile(r"^\d+x\d+$")
+
 
 class OutputConfig(BaseModel):
     """Configuración de salida del video."""
@@ -19,7 +29,7 @@ class OutputConfig(BaseModel):
     @field_validator("resolution")
     @classmethod
     def validate_resolution(cls, v: str) -> str:
-        if not re.match(r"^\d+x\d+$", v):
+        if not _RESOLUTION_RE.match(v):
             raise ValueError("resolution debe tener formato 'WIDTHxHEIGHT' (ej: 1920x1080)")
         return v
 
@@ -31,6 +41,14 @@ class OutputConfig(BaseModel):
     def height(self) -> int:
         return int(self.resolution.split("x")[1])
 
+    @property
+    def color_source(self) -> str:
+        """Fuente lavfi de color sólido a completar con color y duración.
+
+        Uso: ``color_source.format(color="0x1E3A5F") + ":d=5.0"``.
+        """
+        return f"color=c={{color}}:s={self.width}x{self.height}:r={self.fps}"
+
 
 class AudioConfig(BaseModel):
     """Configuración de audio/TTS para una escena."""
@@ -50,6 +68,9 @@ class Character(BaseModel):
     scale: float = Field(default=1.0, ge=0.1, le=3.0)
 
 
+DEFAULT_BACKGROUND_COLOR = "#1E3A5F"
+
+
 class Background(BaseModel):
     """Configuración de fondo de escena."""
 
@@ -57,6 +78,11 @@ class Background(BaseModel):
     image: str | None = None
     video: str | None = None
 
+    @property
+    def ffmpeg_color(self) -> str:
+        """Color en la notación 0xRRGGBB de FFmpeg."""
+        return (self.color or DEFAULT_BACKGROUND_COLOR).replace("#", "0x")
+
 
 class Scene(BaseModel):
     """Una escena individual del video."""
@@ -67,6 +93,13 @@ class Scene(BaseModel):
     audio: AudioConfig | None = None
     background: Background | None = None
 
+    @field_validator("duration")
+    @classmethod
+    def validate_duration(cls, v: str) -> str:
+        if float(v.rstrip("s")) <= 0:
+            raise ValueError("duration debe ser positiva")
+        return v
+
     @property
     def duration_seconds(self) -> float:
         return float(self.duration.rstrip("s"))
@@ -79,14 +112,32 @@ class AnimationSpec(BaseModel):
     output: OutputConfig = Field(default_factory=OutputConfig)
     scenes: list[Scene] = Field(default_factory=list, min_length=1)
 
+    @property
+    def total_duration(self) -> float:
+        """Duración total del spec en segundos."""
+        return sum(scene.duration_seconds for scene in self.scenes)
+
     @classmethod
     def from_yaml(cls, path: Path) -> "AnimationSpec":
         """Carga un spec desde un archivo YAML."""
-        with open(path) as f:
-            data = yaml.safe_load(f)
+        with open(path, "rb") as f:
+            data = yaml.load(f, Loader=_YamlLoader)
         return cls.model_validate(data)
 
+    @classmethod
+    def from_yaml_string(cls, text: str) -> "AnimationSpec":
+        """Carga un spec desde YAML en memoria."""
+        return cls.model_validate(yaml.load(text, Loader=_YamlLoader))
+
     def to_yaml(self, path: Path) -> None:
         """Guarda el spec a un archivo YAML."""
         with open(path, "w") as f:
-            yaml.dump(self.model_dump(), f, default_flow_style=False)
+            yaml.dump(
+                self.model_dump(), f, Dumper=_YamlDumper, default_flow_style=False
+            )
+
+    def to_yaml_string(self) -> str:
+        """Serializa el spec a YAML en memoria."""
+        return yaml.dump(
+            self.model_dump(), Dumper=_YamlDumper, default_flow_style=False
+        )
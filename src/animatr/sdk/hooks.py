@@ -6,28 +6,56 @@ antes y después de operaciones críticas.
 
 from __future__ import annotations
 
+import os
+import sys
 from dataclasses import dataclass
-from enum import Enum
-from typing import TYPE_CHECKING, Any, Callable
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
 
 if TYPE_CHECKING:
     from animatr.schema import AnimationSpec
 
 
-class HookType(Enum):
-    """Tipos de hooks disponibles."""
+class HookType(IntEnum):
+    """Tipos de hooks disponibles.
 
-    PRE_TOOL_USE = "PreToolUse"
-    POST_TOOL_USE = "PostToolUse"
-    PRE_RENDER = "PreRender"
-    POST_RENDER = "PostRender"
-    PRE_CREW = "PreCrew"
-    POST_CREW = "PostCrew"
+    El valor es la posición en la tabla de dispatch de HookRegistry; el
+    nombre público del evento se obtiene con ``event``/``from_event()``.
+    """
 
+    PRE_TOOL_USE = 0
+    POST_TOOL_USE = 1
+    PRE_RENDER = 2
+    POST_RENDER = 3
+    PRE_CREW = 4
+    POST_CREW = 5
 
-@dataclass
-class HookContext:
-    """Contexto pasado a los hooks."""
+    @property
+    def event(self) -> str:
+        """Nombre público del evento ("PreToolUse", "PostRender", ...)."""
+        return _HOOK_EVENTS[self]
+
+    @classmethod
+    def from_event(cls, event: str) -> HookType:
+        """Obtiene el tipo a partir de su nombre público de evento."""
+        for hook_type, name in _HOOK_EVENTS.items():
+            if name == event:
+                return hook_type
+        raise ValueError(f"Unknown hook event: {event}")
+
+
+_HOOK_EVENTS = {
+    HookType.PRE_TOOL_USE: "PreToolUse",
+    HookType.POST_TOOL_USE: "PostToolUse",
+    HookType.PRE_RENDER: "PreRender",
+    HookType.POST_RENDER: "PostRender",
+    HookType.PRE_CREW: "PreCrew",
+    HookType.POST_CREW: "PostCrew",
+}
+
+
+class HookContext(NamedTuple):
+    """Contexto pasado a los hooks (inmutable)."""
 
     tool_name: str
     input_data: Any
@@ -35,7 +63,7 @@ class HookContext:
     metadata: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HookDecision:
     """Decisión de un hook."""
 
@@ -44,13 +72,19 @@ class HookDecision:
     modified_data: Any = None
 
 
+# Decisión "permitir" compartida: inmutable, se reutiliza en el hot path
+_ALLOW = HookDecision(allow=True)
+
+
 class HookRegistry:
     """Registro centralizado de hooks."""
 
     def __init__(self) -> None:
-        self._hooks: dict[HookType, list[Callable[[HookContext], HookDecision]]] = {
-            hook_type: [] for hook_type in HookType
-        }
+        # Una tupla por tipo: se reconstruye al registrar (raro) y se itera
+        # en cada execute (frecuente)
+        self._hooks: list[tuple[Callable[[HookContext], HookDecision], ...]] = [
+            () for _ in HookType
+        ]
 
     def register(
         self,
@@ -58,7 +92,7 @@ class HookRegistry:
         hook: Callable[[HookContext], HookDecision],
     ) -> None:
         """Registra un hook."""
-        self._hooks[hook_type].append(hook)
+        self._hooks[hook_type] = (*self._hooks[hook_type], hook)
 
     def execute(
         self,
@@ -70,15 +104,37 @@ class HookRegistry:
             decision = hook(context)
             if not decision.allow:
                 return decision
-        return HookDecision(allow=True)
+        return _ALLOW
 
 
 # Hooks predefinidos
 
+# Provider TTS → (nombre para mensajes, variable con su API key)
+_PROVIDER_ENV = {
+    "elevenlabs": ("ElevenLabs", "ELEVENLABS_API_KEY"),
+    "openai": ("OpenAI", "OPENAI_API_KEY"),
+}
+
+
+# API keys ya encontradas: solo se recuerdan los positivos, así una key
+# exportada tras un primer fallo se detecta en la siguiente llamada
+_keys_found: set[str] = set()
+
+
+def _has_key(name: str) -> bool:
+    """Indica si una API key está definida."""
+    if name in _keys_found:
+        return True
+    if os.environ.get(name):
+        _keys_found.add(name)
+        return True
+    return False
+
+
 def validate_spec_hook(context: HookContext) -> HookDecision:
     """Valida que el spec sea válido antes de render."""
     if context.tool_name not in ("render", "run_crew"):
-        return HookDecision(allow=True)
+        return _ALLOW
 
     spec = context.input_data
     if hasattr(spec, "scenes") and not spec.scenes:
@@ -87,66 +143,67 @@ def validate_spec_hook(context: HookContext) -> HookDecision:
             reason="Spec must have at least one scene",
         )
 
-    return HookDecision(allow=True)
+    return _ALLOW
 
 
 def check_audio_config_hook(context: HookContext) -> HookDecision:
     """Verifica configuración de audio antes de render."""
     if context.tool_name != "render":
-        return HookDecision(allow=True)
+        return _ALLOW
 
     spec = context.input_data
     if not hasattr(spec, "scenes"):
-        return HookDecision(allow=True)
+        return _ALLOW
 
-    import os
+    # Primera escena que usa cada provider: se valida una vez por provider
+    first_use: dict[str, str] = {}
     for scene in spec.scenes:
-        if scene.audio:
-            if scene.audio.provider == "elevenlabs":
-                if not os.environ.get("ELEVENLABS_API_KEY"):
-                    return HookDecision(
-                        allow=False,
-                        reason=f"Scene {scene.id} uses ElevenLabs but ELEVENLABS_API_KEY not set",
-                    )
-            elif scene.audio.provider == "openai":
-                if not os.environ.get("OPENAI_API_KEY"):
-                    return HookDecision(
-                        allow=False,
-                        reason=f"Scene {scene.id} uses OpenAI but OPENAI_API_KEY not set",
-                    )
-
-    return HookDecision(allow=True)
+        if scene.audio and scene.audio.provider not in first_use:
+            first_use[scene.audio.provider] = scene.id
+
+    for provider, scene_id in first_use.items():
+        required = _PROVIDER_ENV.get(provider)
+        if required and not _has_key(required[1]):
+            label, env_var = required
+            return HookDecision(
+                allow=False,
+                reason=f"Scene {scene_id} uses {label} but {env_var} not set",
+            )
+
+    return _ALLOW
 
 
 def log_operation_hook(context: HookContext) -> HookDecision:
     """Hook de logging para debugging."""
-    print(f"🔧 Tool: {context.tool_name}")
+    line = f"🔧 Tool: {context.tool_name}\n"
     if context.output_data:
-        print(f"   Output: {type(context.output_data).__name__}")
-    return HookDecision(allow=True)
+        line += f"   Output: {type(context.output_data).__name__}\n"
+    sys.stdout.write(line)
+    return _ALLOW
 
 
-def cost_estimation_hook(context: HookContext) -> HookDecision:
-    """Estima y reporta costos de operaciones."""
-    if context.tool_name not in ("run_crew", "render"):
-        return HookDecision(allow=True)
-
-    # Estimaciones aproximadas
-    estimated_costs = {
-        "run_crew": 0.50,  # USD por ejecución promedio
-        "render": 0.10,  # USD por minuto de video
-    }
+# Estimaciones aproximadas, ya formateadas
+_ESTIMATED_COSTS = {
+    "run_crew": 0.50,  # USD por ejecución promedio
+    "render": 0.10,  # USD por minuto de video
+}
+_COST_MESSAGES = {
+    tool: f"💰 Estimated cost: ${cost:.2f}\n" for tool, cost in _ESTIMATED_COSTS.items()
+}
 
-    estimated = estimated_costs.get(context.tool_name, 0)
-    print(f"💰 Estimated cost: ${estimated:.2f}")
 
-    return HookDecision(allow=True)
+def cost_estimation_hook(context: HookContext) -> HookDecision:
+    """Estima y reporta costos de operaciones."""
+    message = _COST_MESSAGES.get(context.tool_name)
+    if message:
+        sys.stdout.write(message)
+    return _ALLOW
 
 
 def rate_limit_hook(context: HookContext) -> HookDecision:
     """Hook de rate limiting (placeholder)."""
     # En producción, implementar rate limiting real
-    return HookDecision(allow=True)
+    return _ALLOW
 
 
 # Factory para crear registry con hooks por defecto
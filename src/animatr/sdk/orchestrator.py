@@ -7,28 +7,36 @@ para orquestar el sistema de agentes desde un nivel superior.
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
 
 from animatr.agents.crew import AnimatrCrew
 from animatr.agents.input_detector import DetectionResult, InputDetector, InputType
-from animatr.orchestrator import Orchestrator
+from animatr.orchestrator import (
+    DEFAULT_RENDER_CACHE_DIR,
+    DEFAULT_TTS_CACHE_DIR,
+    Orchestrator,
+)
 from animatr.schema import AnimationSpec
 from animatr.sdk.tools import AnimatrTools
 
 
-@dataclass
+def _noop(*args: Any, **kwargs: Any) -> None:
+    """Sustituto de print cuando verbose está desactivado."""
+
+
+@dataclass(slots=True)
 class AgentConfig:
     """Configuración para el Agent SDK orchestrator."""
 
     max_turns: int = 20
     max_budget_usd: float = 2.0
-    allowed_tools: list[str] = field(default_factory=lambda: ["mcp__animatr__*"])
+    allowed_tools: tuple[str, ...] = ("mcp__animatr__*",)
     verbose: bool = True
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class HookResult:
     """Resultado de un hook."""
 
@@ -37,6 +45,10 @@ class HookResult:
     modified_input: Any = None
 
 
+# Resultado "permitir" compartido: inmutable, se reutiliza en el hot path
+_ALLOW_RESULT = HookResult(allow=True)
+
+
 class AgentOrchestrator:
     """Orchestrador de alto nivel usando Claude Agent SDK concepts.
 
@@ -52,9 +64,12 @@ class AgentOrchestrator:
         self.tools = AnimatrTools()
         self.detector = InputDetector()
 
-        # Hooks
-        self._pre_tool_hooks: list[Callable] = []
-        self._post_tool_hooks: list[Callable] = []
+        # Salida verbose resuelta una vez: sin rama por llamada
+        self._log: Callable[..., None] = print if self.config.verbose else _noop
+
+        # Hooks (tuplas: se reconstruyen al registrar, se iteran en cada tool)
+        self._pre_tool_hooks: tuple[Callable, ...] = ()
+        self._post_tool_hooks: tuple[Callable, ...] = ()
 
         # Estado
         self._turns_used = 0
@@ -62,32 +77,37 @@ class AgentOrchestrator:
 
     def register_pre_hook(self, hook: Callable[[str, Any], HookResult]) -> None:
         """Registra un hook pre-ejecución de herramienta."""
-        self._pre_tool_hooks.append(hook)
+        self._pre_tool_hooks = (*self._pre_tool_hooks, hook)
 
     def register_post_hook(self, hook: Callable[[str, Any, Any], HookResult]) -> None:
         """Registra un hook post-ejecución de herramienta."""
-        self._post_tool_hooks.append(hook)
+        self._post_tool_hooks = (*self._post_tool_hooks, hook)
 
     def _run_pre_hooks(self, tool_name: str, input_data: Any) -> HookResult:
         """Ejecuta hooks pre-tool."""
+        if not self._pre_tool_hooks:
+            return _ALLOW_RESULT
         for hook in self._pre_tool_hooks:
             result = hook(tool_name, input_data)
             if not result.allow:
                 return result
-        return HookResult(allow=True)
+        return _ALLOW_RESULT
 
     def _run_post_hooks(self, tool_name: str, input_data: Any, output: Any) -> HookResult:
         """Ejecuta hooks post-tool."""
+        if not self._post_tool_hooks:
+            return _ALLOW_RESULT
         for hook in self._post_tool_hooks:
             result = hook(tool_name, input_data, output)
             if not result.allow:
                 return result
-        return HookResult(allow=True)
+        return _ALLOW_RESULT
 
     def process_input(
         self,
         user_input: str | Path,
         output_path: Path | None = None,
+        _detection: DetectionResult | None = None,
     ) -> dict[str, Any]:
         """Procesa input del usuario y genera video.
 
@@ -99,22 +119,24 @@ class AgentOrchestrator:
         Args:
             user_input: Prompt, brief, script, o path a YAML
             output_path: Path para el video de salida
+            _detection: Detección ya calculada para user_input (evita repetirla)
 
         Returns:
             Dict con resultado de la operación
         """
         # Detectar tipo de input
-        detection = self.detector.detect(user_input)
+        detection = _detection or self.detector.detect(user_input)
 
-        if self.config.verbose:
-            print(f"📥 Input type detected: {detection.input_type.value}")
-            print(f"   Confidence: {detection.confidence:.0%}")
+        self._log(
+            f"📥 Input type detected: {detection.input_type.value}\n"
+            f"   Confidence: {detection.confidence:.0%}"
+        )
 
-        # Routing basado en tipo
-        if detection.input_type == InputType.YAML_SPEC:
-            return self._handle_yaml_spec(detection, output_path)
-        else:
-            return self._handle_creative_input(detection, output_path)
+        # Routing basado en tipo (por defecto, crew de agentes)
+        handler = _ROUTE.get(
+            detection.input_type, AgentOrchestrator._handle_creative_input
+        )
+        return handler(self, detection, output_path)
 
     def _handle_yaml_spec(
         self,
@@ -122,8 +144,7 @@ class AgentOrchestrator:
         output_path: Path | None,
     ) -> dict[str, Any]:
         """Maneja YAML spec con bypass de agentes → render directo."""
-        if self.config.verbose:
-            print("⚡ YAML spec detected - bypassing agents")
+        self._log("⚡ YAML spec detected - bypassing agents")
 
         if not detection.parsed_spec:
             return {
@@ -146,7 +167,11 @@ class AgentOrchestrator:
 
         try:
             # Render directo
-            orchestrator = Orchestrator(detection.parsed_spec)
+            orchestrator = Orchestrator(
+                detection.parsed_spec,
+                tts_cache_dir=DEFAULT_TTS_CACHE_DIR,
+                render_cache_dir=DEFAULT_RENDER_CACHE_DIR,
+            )
             video_path = orchestrator.render(output_path)
 
             result = {
@@ -174,8 +199,7 @@ class AgentOrchestrator:
         output_path: Path | None,
     ) -> dict[str, Any]:
         """Maneja input creativo con crew de agentes."""
-        if self.config.verbose:
-            print(f"🎬 Processing with AI crew ({detection.input_type.value})")
+        self._log(f"🎬 Processing with AI crew ({detection.input_type.value})")
 
         # Pre-hook
         pre_result = self._run_pre_hooks("run_crew", detection)
@@ -238,9 +262,10 @@ class AgentOrchestrator:
         if preview:
             return self.tools.preview({"spec_path": prompt, "duration": 5})
 
+        detection = self.detector.detect(prompt)
+
         if no_agents:
             # Forzar bypass
-            detection = self.detector.detect(prompt)
             if detection.input_type == InputType.YAML_SPEC:
                 return self._handle_yaml_spec(detection, output_path)
             else:
@@ -249,7 +274,13 @@ class AgentOrchestrator:
                     "error": "--no-agents requires a valid YAML spec",
                 }
 
-        return self.process_input(prompt, output_path)
+        return self.process_input(prompt, output_path, _detection=detection)
+
+
+# Handler por tipo de input; los tipos ausentes van al crew de agentes
+_ROUTE: dict[InputType, Callable[..., dict[str, Any]]] = {
+    InputType.YAML_SPEC: AgentOrchestrator._handle_yaml_spec,
+}
 
 
 # Hooks predefinidos
@@ -257,7 +288,7 @@ class AgentOrchestrator:
 def pre_render_validation(tool_name: str, input_data: Any) -> HookResult:
     """Hook que valida specs antes del render."""
     if tool_name != "render":
-        return HookResult(allow=True)
+        return _ALLOW_RESULT
 
     # Validar que el spec tiene escenas
     if hasattr(input_data, "scenes") and not input_data.scenes:
@@ -266,21 +297,21 @@ def pre_render_validation(tool_name: str, input_data: Any) -> HookResult:
             message="Spec has no scenes defined",
         )
 
-    return HookResult(allow=True)
+    return _ALLOW_RESULT
 
 
 def post_render_qa(tool_name: str, input_data: Any, output: Any) -> HookResult:
     """Hook que ejecuta QA después del render."""
     if tool_name != "render":
-        return HookResult(allow=True)
+        return _ALLOW_RESULT
 
     # En una implementación completa, aquí se ejecutaría
     # análisis automático del video generado
 
-    return HookResult(allow=True)
+    return _ALLOW_RESULT
 
 
 def budget_check(tool_name: str, input_data: Any) -> HookResult:
     """Hook que verifica presupuesto antes de operaciones costosas."""
     # Placeholder para control de costos
-    return HookResult(allow=True)
+    return _ALLOW_RESULT
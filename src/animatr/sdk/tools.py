@@ -7,12 +7,17 @@ para interactuar con el sistema de agentes y el pipeline de render.
 from pathlib import Path
 from typing import Any
 
-from pydantic import BaseModel, Field
+import yaml
+from pydantic import BaseModel, Field, ValidationError
 
 from animatr.agents.crew import AnimatrCrew
 from animatr.agents.input_detector import DetectionResult, InputDetector, InputType
-from animatr.orchestrator import Orchestrator
-from animatr.schema import AnimationSpec
+from animatr.orchestrator import (
+    DEFAULT_RENDER_CACHE_DIR,
+    DEFAULT_TTS_CACHE_DIR,
+    Orchestrator,
+)
+from animatr.schema import AnimationSpec, Background
 
 
 class RunCrewInput(BaseModel):
@@ -70,6 +75,19 @@ class PreviewInput(BaseModel):
     duration: int = Field(default=5, description="Duración del preview en segundos")
 
 
+# Campos de Background en orden de prioridad para el tipo de preview
+_BACKGROUND_KEYS = ("color", "image", "video")
+
+
+def _background_type(background: Background | None) -> str:
+    """Tipo de fondo de una escena: el primer campo definido, o "none"."""
+    if background is not None:
+        for key in _BACKGROUND_KEYS:
+            if getattr(background, key):
+                return key
+    return "none"
+
+
 class AnimatrTools:
     """Herramientas MCP para ANIMATR."""
 
@@ -110,11 +128,12 @@ class AnimatrTools:
                 max_iterations=input_data.max_iterations,
             )
 
+            inner = getattr(self.crew, "_crew", None)
             return RunCrewOutput(
                 success=True,
                 result=result,
                 approved=approved,
-                iterations=self.crew._crew.iteration if hasattr(self.crew, '_crew') else 1,
+                iterations=inner.iteration if inner is not None else 1,
                 input_type=detection.input_type.value,
             )
 
@@ -140,11 +159,15 @@ class AnimatrTools:
             spec = AnimationSpec.from_yaml(spec_path)
 
             # Crear orchestrator y renderizar
-            orchestrator = Orchestrator(spec)
+            orchestrator = Orchestrator(
+                spec,
+                tts_cache_dir=DEFAULT_TTS_CACHE_DIR,
+                render_cache_dir=DEFAULT_RENDER_CACHE_DIR,
+            )
             result_path = orchestrator.render(output_path)
 
             # Calcular duración total
-            total_duration = sum(scene.duration_seconds for scene in spec.scenes)
+            total_duration = spec.total_duration
 
             return RenderOutput(
                 success=True,
@@ -160,9 +183,6 @@ class AnimatrTools:
 
     def validate_spec(self, input_data: ValidateSpecInput) -> ValidateSpecOutput:
         """Valida un spec YAML contra el schema."""
-        import yaml
-        from pydantic import ValidationError
-
         errors: list[str] = []
         warnings: list[str] = []
 
@@ -177,17 +197,11 @@ class AnimatrTools:
             # Validar contra schema
             spec = AnimationSpec.model_validate(data)
 
-            # Validaciones adicionales
+            # Duración positiva y texto de audio los valida el propio schema;
+            # aquí solo queda el spec sin clave "scenes" (default vacío)
             if not spec.scenes:
                 errors.append("No scenes defined")
 
-            for scene in spec.scenes:
-                if scene.duration_seconds <= 0:
-                    errors.append(f"Scene {scene.id}: duration must be positive")
-
-                if scene.audio and not scene.audio.text:
-                    warnings.append(f"Scene {scene.id}: audio defined but no text")
-
             return ValidateSpecOutput(
                 valid=len(errors) == 0,
                 errors=errors,
@@ -213,47 +227,43 @@ class AnimatrTools:
             spec_path = Path(input_data.spec_path)
             spec = AnimationSpec.from_yaml(spec_path)
 
+            # Una sola pasada: duración total + escenas dentro del preview
+            budget = input_data.duration
+            total = 0.0
+            scenes_preview: list[dict[str, Any]] = []
+            append = scenes_preview.append
+            for scene in spec.scenes:
+                if total < budget:
+                    append({
+                        "id": scene.id,
+                        "duration": scene.duration,
+                        "has_audio": scene.audio is not None,
+                        "has_character": scene.character is not None,
+                        "background_type": _background_type(scene.background),
+                    })
+                total += scene.duration_seconds
+
             # Información del preview
             preview_info = {
                 "total_scenes": len(spec.scenes),
-                "total_duration": sum(s.duration_seconds for s in spec.scenes),
-                "preview_duration": min(input_data.duration, sum(s.duration_seconds for s in spec.scenes)),
+                "total_duration": total,
+                "preview_duration": min(budget, total),
                 "output_config": {
                     "format": spec.output.format,
                     "resolution": spec.output.resolution,
                     "fps": spec.output.fps,
                 },
-                "scenes_preview": [],
+                "scenes_preview": scenes_preview,
             }
 
-            cumulative = 0.0
-            for scene in spec.scenes:
-                if cumulative >= input_data.duration:
-                    break
-
-                preview_info["scenes_preview"].append({
-                    "id": scene.id,
-                    "duration": scene.duration,
-                    "has_audio": scene.audio is not None,
-                    "has_character": scene.character is not None,
-                    "background_type": (
-                        "color" if scene.background and scene.background.color
-                        else "image" if scene.background and scene.background.image
-                        else "video" if scene.background and scene.background.video
-                        else "none"
-                    ),
-                })
-
-                cumulative += scene.duration_seconds
-
             return {"success": True, **preview_info}
 
         except Exception as e:
             return {"success": False, "error": str(e)}
 
 
-# Definición de herramientas para MCP
-ANIMATR_TOOLS = [
+# Definición de herramientas para MCP (schemas generados una vez al importar)
+ANIMATR_TOOLS = (
     {
         "name": "run_crew",
         "description": "Execute the AI crew to create a video from any input type",
@@ -274,4 +284,4 @@ ANIMATR_TOOLS = [
         "description": "Generate a quick preview of a spec",
         "input_schema": PreviewInput.model_json_schema(),
     },
-]
+)
@@ -1,12 +1,13 @@
 """Pytest fixtures for ANIMATR tests."""
 
 import tempfile
+from collections.abc import Callable, Generator
 from pathlib import Path
-from typing import Generator
 
 import pytest
 
-from animatr.db.manager import ProjectManager
+from animatr.db.manager import MEMORY_DB, ProjectManager
+from animatr.db.models import Project, RenderJob
 from animatr.schema import AnimationSpec, AudioConfig, Background, Character, OutputConfig, Scene
 
 
@@ -17,15 +18,78 @@ def temp_dir() -> Generator[Path, None, None]:
         yield Path(tmpdir)
 
 
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Directorio compartido por toda la sesión.
+
+    Para tests que solo escriben ficheros propios: usar nombres únicos por
+    test (p. ej. con request.node.name). Se limpia una vez al final.
+    """
+    return tmp_path_factory.mktemp("animatr_tests")
+
+
 @pytest.fixture
-def temp_db(temp_dir: Path) -> Generator[ProjectManager, None, None]:
-    """Base de datos temporal para tests."""
-    db_path = temp_dir / "test.db"
-    manager = ProjectManager(db_path)
+def temp_db() -> Generator[ProjectManager, None, None]:
+    """Base de datos temporal en memoria para tests.
+
+    Cada manager crea su propia base con nombre único, así que los workers
+    de pytest-xdist (pytest -n auto) nunca comparten estado.
+    """
+    manager = ProjectManager(MEMORY_DB)
     yield manager
 
 
 @pytest.fixture
+def make_projects(temp_db: ProjectManager) -> Callable[[int], list[Project]]:
+    """Factory que crea N proyectos con un solo commit."""
+
+    def _make(n: int) -> list[Project]:
+        specs = [{"name": f"Project {i}"} for i in range(n)]
+        return temp_db.bulk_create_projects(specs)
+
+    return _make
+
+
+@pytest.fixture
+def make_render_jobs(temp_db: ProjectManager) -> Callable[..., list[RenderJob]]:
+    """Factory que crea un render job por proyecto en una sola transacción."""
+
+    def _make(projects: list[Project], total_scenes: int = 0) -> list[RenderJob]:
+        with temp_db.transaction():
+            return [
+                temp_db.create_render_job(
+                    p.id,  # type: ignore
+                    total_scenes=total_scenes,
+                )
+                for p in projects
+            ]
+
+    return _make
+
+
+@pytest.fixture
+def make_files(temp_dir: Path) -> Callable[..., list[tuple[Path, int]]]:
+    """Factory que crea N ficheros pequeños y devuelve (path, tamaño) de cada uno.
+
+    El tamaño se conoce de antemano, así que no hace falta stat al registrarlos.
+    """
+
+    def _make(
+        n: int, prefix: str = "asset", content: bytes = b"test"
+    ) -> list[tuple[Path, int]]:
+        files = []
+        for i in range(n):
+            path = temp_dir / f"{prefix}_{i}.txt"
+            path.write_bytes(content)
+            files.append((path, len(content)))
+        return files
+
+    return _make
+
+
+# Los modelos de ejemplo se construyen una vez por sesión: los tests solo los
+# leen. Un test que necesite modificarlos debe usar .model_copy(deep=True).
+@pytest.fixture(scope="session")
 def sample_audio_config() -> AudioConfig:
     """Configuración de audio de ejemplo."""
     return AudioConfig(
@@ -36,7 +100,7 @@ def sample_audio_config() -> AudioConfig:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_character() -> Character:
     """Personaje de ejemplo."""
     return Character(
@@ -47,13 +111,13 @@ def sample_character() -> Character:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_background() -> Background:
     """Fondo de ejemplo."""
     return Background(color="#1E3A5F")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_scene(
     sample_audio_config: AudioConfig,
     sample_character: Character,
@@ -69,7 +133,7 @@ def sample_scene(
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_output_config() -> OutputConfig:
     """Configuración de salida de ejemplo."""
     return OutputConfig(
@@ -79,7 +143,7 @@ def sample_output_config() -> OutputConfig:
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_spec(sample_scene: Scene, sample_output_config: OutputConfig) -> AnimationSpec:
     """Spec de animación de ejemplo."""
     return AnimationSpec(
@@ -1,11 +1,14 @@
 """Tests para el módulo de base de datos."""
 
+import os
+import sqlite3
+from collections.abc import Callable
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
-from animatr.db.manager import ProjectManager
+from animatr.db.manager import MEMORY_DB, ProjectManager
 from animatr.db.models import Asset, AssetType, Project, RenderJob, RenderStatus
 
 
@@ -20,6 +23,16 @@ class TestProjectManager:
         assert db_path.exists()
         assert manager.db_path == db_path
 
+    def test_disk_database_uses_wal(self, temp_dir: Path) -> None:
+        """Verifica que la base en disco usa journal WAL."""
+        ProjectManager(temp_dir / "test.db")
+
+        conn = sqlite3.connect(temp_dir / "test.db")
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
     def test_init_creates_tables(self, temp_db: ProjectManager) -> None:
         """Verifica que se crean las tablas necesarias."""
         stats = temp_db.stats()
@@ -27,6 +40,26 @@ class TestProjectManager:
         assert "total_assets" in stats
         assert "total_render_jobs" in stats
 
+    def test_memory_database_is_isolated(self) -> None:
+        """Verifica que cada manager en memoria tiene su propia base."""
+        first = ProjectManager(MEMORY_DB)
+        second = ProjectManager(MEMORY_DB)
+        first.create_project(name="Only here")
+
+        assert len(first.list_projects()) == 1
+        assert second.list_projects() == []
+
+    def test_backup_memory_database(
+        self, temp_db: ProjectManager, temp_dir: Path
+    ) -> None:
+        """Verifica backup de una base en memoria a disco."""
+        temp_db.create_project(name="Test")
+
+        backup_path = temp_dir / "backup.db"
+        temp_db.backup(backup_path)
+
+        assert len(ProjectManager(backup_path).list_projects()) == 1
+
 
 class TestProjectCRUD:
     """Tests para operaciones CRUD de proyectos."""
@@ -67,9 +100,10 @@ class TestProjectCRUD:
 
     def test_list_projects(self, temp_db: ProjectManager) -> None:
         """Verifica listado de proyectos."""
-        temp_db.create_project(name="Project 1")
-        temp_db.create_project(name="Project 2")
-        temp_db.create_project(name="Project 3")
+        with temp_db.transaction():
+            temp_db.create_project(name="Project 1")
+            temp_db.create_project(name="Project 2")
+            temp_db.create_project(name="Project 3")
 
         projects = temp_db.list_projects()
         assert len(projects) == 3
@@ -105,6 +139,24 @@ class TestProjectCRUD:
         assert result is True
         assert temp_db.get_project(project.id) is None  # type: ignore
 
+    def test_get_project_after_update_is_fresh(self, temp_db: ProjectManager) -> None:
+        """Verifica que get_project devuelve los datos tras un update."""
+        project = temp_db.create_project(name="Original")
+        temp_db.get_project(project.id)  # type: ignore
+        temp_db.update_project(project.id, name="Renamed")  # type: ignore
+
+        assert temp_db.get_project(project.id).name == "Renamed"  # type: ignore
+
+    def test_shared_file_sees_other_manager_writes(self, temp_dir: Path) -> None:
+        """Verifica que un manager en disco ve escrituras de otro manager."""
+        reader = ProjectManager(temp_dir / "shared.db")
+        writer = ProjectManager(temp_dir / "shared.db")
+        project = reader.create_project(name="Original")
+        reader.get_project(project.id)  # type: ignore
+        writer.update_project(project.id, name="Renamed")  # type: ignore
+
+        assert reader.get_project(project.id).name == "Renamed"  # type: ignore
+
     def test_delete_nonexistent_project(self, temp_db: ProjectManager) -> None:
         """Verifica que eliminar proyecto inexistente retorna False."""
         result = temp_db.delete_project(9999)
@@ -134,19 +186,20 @@ class TestAssetCRUD:
         assert asset.asset_type == AssetType.CHARACTER
         assert asset.file_size > 0
 
-    def test_list_assets(self, temp_db: ProjectManager, temp_dir: Path) -> None:
+    def test_list_assets(
+        self, temp_db: ProjectManager, make_files: Callable[..., list[tuple[Path, int]]]
+    ) -> None:
         """Verifica listado de assets."""
         project = temp_db.create_project(name="Test")
 
-        for i, atype in enumerate([AssetType.CHARACTER, AssetType.BACKGROUND, AssetType.AUDIO]):
-            file = temp_dir / f"asset_{i}.txt"
-            file.write_text("test")
-            temp_db.add_asset(
-                project_id=project.id,  # type: ignore
-                name=f"Asset {i}",
-                asset_type=atype,
-                file_path=file,
-            )
+        atypes = [AssetType.CHARACTER, AssetType.BACKGROUND, AssetType.AUDIO]
+        files = zip(atypes, make_files(3), strict=True)
+        items = [
+            (f"Asset {i}", atype, path, size)
+            for i, (atype, (path, size)) in enumerate(files)
+        ]
+
+        assert temp_db.bulk_add_assets(project.id, items) == 3  # type: ignore
 
         assets = temp_db.list_assets(project.id)  # type: ignore
         assert len(assets) == 3
@@ -156,27 +209,38 @@ class TestAssetCRUD:
         project = temp_db.create_project(name="Test")
 
         for i in range(3):
-            file = temp_dir / f"char_{i}.txt"
-            file.write_text("test")
-            temp_db.add_asset(
-                project_id=project.id,  # type: ignore
-                name=f"Character {i}",
-                asset_type=AssetType.CHARACTER,
-                file_path=file,
-            )
-
-        bg_file = temp_dir / "bg.txt"
-        bg_file.write_text("test")
-        temp_db.add_asset(
-            project_id=project.id,  # type: ignore
-            name="Background",
-            asset_type=AssetType.BACKGROUND,
-            file_path=bg_file,
+            (temp_dir / f"char_{i}.txt").write_text("test")
+        (temp_dir / "bg.txt").write_text("test")
+
+        # Tamaños de un solo recorrido del directorio, sin stat por asset
+        sizes = {e.name: e.stat().st_size for e in os.scandir(temp_dir)}
+        items = [
+            (f"Character {i}", AssetType.CHARACTER, temp_dir / name, sizes[name])
+            for i, name in enumerate(f"char_{i}.txt" for i in range(3))
+        ]
+        items.append(
+            ("Background", AssetType.BACKGROUND, temp_dir / "bg.txt", sizes["bg.txt"])
         )
 
+        temp_db.bulk_add_assets(project.id, items)  # type: ignore
+
         characters = temp_db.list_assets(project.id, asset_type=AssetType.CHARACTER)  # type: ignore
         assert len(characters) == 3
 
+    def test_add_asset_with_known_size(self, temp_db: ProjectManager) -> None:
+        """Verifica que un file_size explícito se guarda sin leer el fichero."""
+        project = temp_db.create_project(name="Test")
+
+        asset = temp_db.add_asset(
+            project_id=project.id,  # type: ignore
+            name="Remote",
+            asset_type=AssetType.VIDEO,
+            file_path="/does/not/exist.mp4",
+            file_size=2048,
+        )
+
+        assert asset.file_size == 2048
+
     def test_delete_asset(self, temp_db: ProjectManager, temp_dir: Path) -> None:
         """Verifica eliminación de asset."""
         project = temp_db.create_project(name="Test")
@@ -195,6 +259,20 @@ class TestAssetCRUD:
         assert temp_db.get_asset(asset.id) is None  # type: ignore
 
 
+class TestTransaction:
+    """Tests para transacciones explícitas."""
+
+    def test_transaction_rolls_back_on_error(self, temp_db: ProjectManager) -> None:
+        """Verifica que un error dentro del bloque descarta todas las escrituras."""
+        with pytest.raises(RuntimeError):
+            with temp_db.transaction():
+                temp_db.create_project(name="Project 1")
+                temp_db.create_project(name="Project 2")
+                raise RuntimeError("boom")
+
+        assert temp_db.list_projects() == []
+
+
 class TestRenderJobCRUD:
     """Tests para operaciones de render jobs."""
 
@@ -283,8 +361,9 @@ class TestRenderJobCRUD:
         """Verifica listado de render jobs."""
         project = temp_db.create_project(name="Test")
 
-        for _ in range(3):
-            temp_db.create_render_job(project.id)  # type: ignore
+        with temp_db.transaction():
+            for _ in range(3):
+                temp_db.create_render_job(project.id)  # type: ignore
 
         jobs = temp_db.list_render_jobs(project_id=project.id)  # type: ignore
         assert len(jobs) == 3
@@ -330,8 +409,8 @@ class TestSceneRender:
         project = temp_db.create_project(name="Test")
         job = temp_db.create_render_job(project.id)  # type: ignore
 
-        for scene_id in ["intro", "main", "outro"]:
-            temp_db.add_scene_render(job.id, scene_id=scene_id)  # type: ignore
+        scene_ids = ["intro", "main", "outro"]
+        temp_db.bulk_add_scene_renders(job.id, scene_ids)  # type: ignore
 
         renders = temp_db.list_scene_renders(job.id)  # type: ignore
         assert len(renders) == 3
@@ -340,20 +419,18 @@ class TestSceneRender:
 class TestProjectSummary:
     """Tests para resumen de proyecto."""
 
-    def test_get_project_summary(self, temp_db: ProjectManager, temp_dir: Path) -> None:
+    def test_get_project_summary(
+        self, temp_db: ProjectManager, make_files: Callable[..., list[tuple[Path, int]]]
+    ) -> None:
         """Verifica obtención de resumen."""
         project = temp_db.create_project(name="Test", description="Test project")
 
         # Add assets
-        for i in range(2):
-            file = temp_dir / f"char_{i}.txt"
-            file.write_text("test")
-            temp_db.add_asset(
-                project_id=project.id,  # type: ignore
-                name=f"Character {i}",
-                asset_type=AssetType.CHARACTER,
-                file_path=file,
-            )
+        items = [
+            (f"Character {i}", AssetType.CHARACTER, path, size)
+            for i, (path, size) in enumerate(make_files(2, prefix="char"))
+        ]
+        temp_db.bulk_add_assets(project.id, items)  # type: ignore
 
         # Add render job
         job = temp_db.create_render_job(project.id, total_scenes=3)  # type: ignore
@@ -380,12 +457,13 @@ class TestDatabaseUtilities:
         assert "total_render_jobs" in stats
         assert "database_path" in stats
 
-    def test_backup(self, temp_db: ProjectManager, temp_dir: Path) -> None:
+    def test_backup(self, temp_dir: Path) -> None:
         """Verifica backup de base de datos."""
-        temp_db.create_project(name="Test")
+        manager = ProjectManager(temp_dir / "test.db")
+        manager.create_project(name="Test")
 
         backup_path = temp_dir / "backup.db"
-        temp_db.backup(backup_path)
+        manager.backup(backup_path)
 
         assert backup_path.exists()
 
@@ -8,7 +8,12 @@ import pytest
 from animatr.engines.audio import AudioEngine
 from animatr.engines.base import Engine, EngineResult
 from animatr.engines.blender import BlenderEngine, BlenderSceneConfig
-from animatr.engines.moho import MohoConfig, MohoEngine
+from animatr.engines.moho import (
+    LipSyncData,
+    MohoAssetManager,
+    MohoConfig,
+    MohoEngine,
+)
 from animatr.schema import AudioConfig, Character
 
 
@@ -91,6 +96,48 @@ class TestMohoEngine:
         is_valid = engine.validate(config)
         assert isinstance(is_valid, bool)
 
+    def test_cleanup_temp_dir(self, temp_dir: Path) -> None:
+        """Verifica que solo se borra el directorio temporal propio."""
+        with MohoEngine() as engine:
+            own_dir = engine._temp_dir
+            assert own_dir.exists()
+        assert not own_dir.exists()
+
+        shared = temp_dir / "shared"
+        engine = MohoEngine(temp_root=shared)
+        engine.cleanup()
+        assert shared.exists()
+
+    def test_list_characters_recursive(self, temp_dir: Path) -> None:
+        """Verifica que se encuentran personajes en subdirectorios."""
+        (temp_dir / "heroes" / "main").mkdir(parents=True)
+        (temp_dir / "hero.moho").touch()
+        (temp_dir / "heroes" / "main" / "villain.moho").touch()
+        (temp_dir / "heroes" / "notes.txt").touch()
+
+        characters = MohoAssetManager(temp_dir).list_characters()
+
+        assert sorted(c["name"] for c in characters) == ["hero", "villain"]
+
+    def test_lua_script_collapses_repeated_visemes(self) -> None:
+        """Verifica que las rachas del mismo viseme se reducen a sus extremos."""
+        engine = MohoEngine()
+        phonemes = [
+            {"time": i * 0.1, "phoneme": p}
+            for i, p in enumerate(["SIL", "SIL", "SIL", "SIL", "AA", "M"])
+        ]
+
+        script = engine._generate_lua_script(
+            config=MohoConfig(character=Character(asset="char.moho")),
+            lip_sync_data=LipSyncData(phonemes=phonemes, duration=0.6),
+            output_dir=Path("/tmp/frames"),
+        )
+
+        assert script.count('viseme = "mouth_rest"') == 2
+        assert "{frame = 0," in script
+        assert "{frame = 9," in script
+        assert "{frame = 3," not in script
+
     @patch("subprocess.run")
     def test_process_with_fallback(
         self, mock_run: MagicMock, temp_dir: Path
@@ -118,6 +165,19 @@ class TestMohoEngine:
         # Fallback should generate placeholder frames
         assert result.duration >= 0
 
+    def test_lazy_lookup_on_process(self, temp_dir: Path) -> None:
+        """Verifica que Moho se busca en el primer process() con lazy=True."""
+        with patch.object(MohoEngine, "_find_moho", return_value=None) as find:
+            engine = MohoEngine(temp_root=temp_dir, lazy=True)
+            find.assert_not_called()
+
+            config = MohoConfig(character=Character(asset="char.moho"), duration=1.0)
+            with pytest.raises(RuntimeError):
+                engine.process(config)
+
+        find.assert_called_once()
+        assert not (temp_dir / "animate.lua").exists()
+
 
 class TestBlenderEngine:
     """Tests para BlenderEngine."""
@@ -211,6 +271,88 @@ class TestBlenderEngine:
 
         assert result.scene_id == "test"
 
+    def test_render_cache_hit_and_miss(self, temp_dir: Path) -> None:
+        """Verifica que el cache persiste entre engines y sigue a las entradas."""
+        audio_path = temp_dir / "voice.mp3"
+        audio_path.write_bytes(b"first take")
+        config = BlenderSceneConfig(
+            scene_id="intro", duration=2.0, audio_path=audio_path
+        )
+
+        def fake_render(
+            script: str, output_path: Path, worker_id: int = 0
+        ) -> tuple[bool, float]:
+            output_path.write_bytes(b"video")
+            return True, 1.0
+
+        def render(engine: BlenderEngine) -> tuple[object, MagicMock]:
+            with patch.object(engine, "_run_blender", side_effect=fake_render) as run:
+                return engine.process(config), run
+
+        cache_dir = temp_dir / "cache"
+        blender = Path("blender")
+        with patch.object(BlenderEngine, "_find_blender", return_value=blender):
+            first, run = render(BlenderEngine(cache_dir=cache_dir))
+            assert run.call_count == 1
+            assert first.metadata["cached"] is False  # type: ignore
+
+            # Otra instancia (otra ejecución) reutiliza el video
+            second, run = render(BlenderEngine(cache_dir=cache_dir))
+            run.assert_not_called()
+            assert second.metadata["cached"] is True  # type: ignore
+            assert second.output_path == first.output_path  # type: ignore
+
+            # Mismo path de audio con otro contenido: se vuelve a renderizar
+            audio_path.write_bytes(b"second, longer take")
+            third, run = render(BlenderEngine(cache_dir=cache_dir))
+            assert run.call_count == 1
+            assert third.output_path != first.output_path  # type: ignore
+            assert not list(cache_dir.glob("*.part.*"))
+
+    def test_render_cache_skips_failures_and_characters(self, temp_dir: Path) -> None:
+        """Verifica que no quedan parciales ni entradas con frames de Moho."""
+        frames_dir = temp_dir / "frames"
+        frames_dir.mkdir()
+        cache_dir = temp_dir / "cache"
+
+        def failed_render(
+            script: str, output_path: Path, worker_id: int = 0
+        ) -> tuple[bool, float]:
+            output_path.write_bytes(b"half a video")
+            return False, 1.0
+
+        blender = Path("blender")
+        with patch.object(BlenderEngine, "_find_blender", return_value=blender):
+            engine = BlenderEngine(cache_dir=cache_dir)
+            with patch.object(
+                engine, "_run_blender", side_effect=failed_render
+            ), patch.object(engine, "_process_without_blender") as fallback:
+                engine.process(BlenderSceneConfig(scene_id="a", duration=1.0))
+                engine.process(
+                    BlenderSceneConfig(
+                        scene_id="b", duration=1.0, character_frames_dir=frames_dir
+                    )
+                )
+
+        assert fallback.call_count == 2
+        assert not list(cache_dir.iterdir())
+
+    def test_render_cache_is_opt_in(self) -> None:
+        """Verifica que sin cache_dir los renders quedan en el temp del engine."""
+        with patch.object(BlenderEngine, "_find_blender", return_value=Path("blender")):
+            engine = BlenderEngine()
+
+        def fake_render(
+            script: str, output_path: Path, worker_id: int = 0
+        ) -> tuple[bool, float]:
+            output_path.write_bytes(b"video")
+            return True, 1.0
+
+        with patch.object(engine, "_run_blender", side_effect=fake_render):
+            result = engine.process(BlenderSceneConfig(scene_id="a", duration=1.0))
+
+        assert result.output_path.parent == engine._temp_dir  # type: ignore
+
 
 class TestAudioEngine:
     """Tests para AudioEngine."""
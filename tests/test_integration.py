@@ -1,11 +1,13 @@
 """Tests de integración para ANIMATR."""
 
+from collections.abc import Callable
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
 
 from animatr.db.manager import ProjectManager
-from animatr.db.models import AssetType, RenderStatus
+from animatr.db.models import AssetType, Project, RenderJob, RenderStatus
 from animatr.schema import AnimationSpec, AudioConfig, Background, Character, Scene
 
 
@@ -13,11 +15,15 @@ class TestFullWorkflow:
     """Tests para el flujo completo de ANIMATR."""
 
     def test_create_project_from_spec(
-        self, temp_db: ProjectManager, sample_spec: AnimationSpec, temp_dir: Path
+        self,
+        temp_db: ProjectManager,
+        sample_spec: AnimationSpec,
+        shared_tmp: Path,
+        request: pytest.FixtureRequest,
     ) -> None:
         """Verifica creación de proyecto desde spec."""
         # Save spec to file
-        spec_path = temp_dir / "project.yaml"
+        spec_path = shared_tmp / f"project_{request.node.name}.yaml"
         sample_spec.to_yaml(spec_path)
 
         # Create project
@@ -47,7 +53,8 @@ class TestFullWorkflow:
 
         for name, atype, filename in assets_data:
             asset_file = temp_dir / filename
-            asset_file.write_bytes(b"\x00" * 100)
+            with open(asset_file, "wb") as fh:
+                fh.truncate(100)
             temp_db.add_asset(
                 project_id=project.id,
                 name=name,
@@ -74,8 +81,7 @@ class TestFullWorkflow:
 
         # Add scene renders
         scenes = ["intro", "main", "outro"]
-        for scene_id in scenes:
-            temp_db.add_scene_render(job.id, scene_id=scene_id)
+        temp_db.bulk_add_scene_renders(job.id, scenes)
 
         # Start processing
         job = temp_db.update_render_job(job.id, status=RenderStatus.PROCESSING)
@@ -84,22 +90,19 @@ class TestFullWorkflow:
 
         # Process scenes
         scene_renders = temp_db.list_scene_renders(job.id)
-        for i, scene in enumerate(scene_renders):
+        for scene in scene_renders:
             temp_db.update_scene_render(
                 scene.id,
                 status=RenderStatus.COMPLETED,
                 duration=5.0,
             )
-            temp_db.update_render_job(
-                job.id,
-                completed_scenes=i + 1,
-                progress=(i + 1) / len(scene_renders),
-            )
 
-        # Complete job
+        # Complete job (progreso final en la misma actualización)
         job = temp_db.update_render_job(
             job.id,
             status=RenderStatus.COMPLETED,
+            completed_scenes=len(scene_renders),
+            progress=1.0,
             output_path="/output/final.mp4",
         )
 
@@ -199,11 +202,10 @@ class TestSpecValidation:
         spec = AnimationSpec(scenes=scenes)
 
         assert len(spec.scenes) == 3
-        total_duration = sum(s.duration_seconds for s in spec.scenes)
-        assert total_duration == 40.0
+        assert spec.total_duration == 40.0
 
-    def test_spec_roundtrip(self, temp_dir: Path) -> None:
-        """Verifica que spec se puede guardar y cargar."""
+    def test_spec_roundtrip(self) -> None:
+        """Verifica que spec sobrevive a un round-trip dump/validate."""
         original = AnimationSpec(
             scenes=[
                 Scene(
@@ -215,15 +217,9 @@ class TestSpecValidation:
             ]
         )
 
-        path = temp_dir / "spec.yaml"
-        original.to_yaml(path)
-
-        loaded = AnimationSpec.from_yaml(path)
+        loaded = AnimationSpec.model_validate(original.model_dump())
 
-        assert loaded.version == original.version
-        assert len(loaded.scenes) == len(original.scenes)
-        assert loaded.scenes[0].id == original.scenes[0].id
-        assert loaded.scenes[0].duration == original.scenes[0].duration
+        assert loaded == original
 
 
 class TestMultiProjectManagement:
@@ -232,8 +228,10 @@ class TestMultiProjectManagement:
     def test_list_projects_pagination(self, temp_db: ProjectManager) -> None:
         """Verifica paginación de proyectos."""
         # Create 15 projects
-        for i in range(15):
-            temp_db.create_project(name=f"Project {i:02d}")
+        created = temp_db.bulk_create_projects(
+            [{"name": f"Project {i:02d}"} for i in range(15)]
+        )
+        assert [p.name for p in created] == [f"Project {i:02d}" for i in range(15)]
 
         # Get first page
         page1 = temp_db.list_projects(limit=10, offset=0)
@@ -243,18 +241,17 @@ class TestMultiProjectManagement:
         page2 = temp_db.list_projects(limit=10, offset=10)
         assert len(page2) == 5
 
-    def test_concurrent_render_jobs(self, temp_db: ProjectManager) -> None:
+    def test_concurrent_render_jobs(
+        self,
+        temp_db: ProjectManager,
+        make_projects: Callable[[int], list[Project]],
+        make_render_jobs: Callable[..., list[RenderJob]],
+    ) -> None:
         """Verifica múltiples jobs de render simultáneos."""
-        projects = [
-            temp_db.create_project(name=f"Project {i}")
-            for i in range(3)
-        ]
+        projects = make_projects(3)
 
         # Start render for each project
-        jobs = [
-            temp_db.create_render_job(p.id, total_scenes=2)
-            for p in projects
-        ]
+        jobs = make_render_jobs(projects, total_scenes=2)
 
         # Process all simultaneously
         for job in jobs:
@@ -288,7 +285,7 @@ class TestDataIntegrity:
         assert loaded.metadata["settings"]["quality"] == "high"
 
     def test_asset_file_size_tracking(
-        self, temp_db: ProjectManager, temp_dir: Path
+        self, temp_db: ProjectManager, shared_tmp: Path, request: pytest.FixtureRequest
     ) -> None:
         """Verifica tracking de tamaño de archivos."""
         project = temp_db.create_project(name="Size Test")
@@ -297,32 +294,39 @@ class TestDataIntegrity:
         sizes = [1024, 2048, 4096]
         total_expected = sum(sizes)
 
+        items = []
         for i, size in enumerate(sizes):
-            file = temp_dir / f"file_{i}.bin"
-            file.write_bytes(b"\x00" * size)
-            temp_db.add_asset(
-                project_id=project.id,
-                name=f"File {i}",
-                asset_type=AssetType.OTHER,
-                file_path=file,
-            )
+            file = shared_tmp / f"{request.node.name}_{i}.bin"
+            # Fichero del tamaño pedido sin escribir un buffer de ceros
+            with open(file, "wb") as fh:
+                fh.truncate(size)
+            items.append((f"File {i}", AssetType.OTHER, file))
+        temp_db.bulk_add_assets(project.id, items)
 
         stats = temp_db.stats()
         assert stats["total_asset_size_bytes"] == total_expected
 
-    def test_render_duration_calculation(self, temp_db: ProjectManager) -> None:
+    def test_render_duration_calculation(
+        self, temp_db: ProjectManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """Verifica cálculo de duración de render."""
         project = temp_db.create_project(name="Duration Test")
         job = temp_db.create_render_job(project.id)
 
-        # Start processing
-        temp_db.update_render_job(job.id, status=RenderStatus.PROCESSING)
+        # Reloj fijo: inicio y fin separados exactamente 5 segundos
+        t0 = datetime(2025, 1, 1, 12, 0, 0)
+        ticks = iter([t0, t0 + timedelta(seconds=5)])
+
+        class FakeDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):  # type: ignore[override]
+                return next(ticks)
 
-        # Small delay would be needed for real duration
-        # For test, just verify the fields are set correctly
+        monkeypatch.setattr("animatr.db.manager.datetime", FakeDatetime)
+
+        temp_db.update_render_job(job.id, status=RenderStatus.PROCESSING)
         temp_db.update_render_job(job.id, status=RenderStatus.COMPLETED)
 
         completed = temp_db.get_render_job(job.id)
-        assert completed.started_at is not None
-        assert completed.completed_at is not None
-        assert completed.duration_seconds is not None
+        assert completed.started_at == t0
+        assert completed.duration_seconds == 5.0
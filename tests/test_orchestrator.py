@@ -0,0 +1,401 @@
+"""Tests para el Orchestrator de ANIMATR (engines y FFmpeg mockeados)."""
+
+import threading
+from collections.abc import Generator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from animatr.db.manager import ProjectManager
+from animatr.db.models import RenderStatus
+from animatr.engines.base import EngineResult
+from animatr.engines.blender import BlenderResult, BlenderSceneConfig
+from animatr.engines.moho import MohoConfig, MohoResult
+from animatr.orchestrator import Orchestrator, RenderProgress
+from animatr.schema import AnimationSpec, AudioConfig, Background, Character, Scene
+
+
+def _spec(*scenes: Scene) -> AnimationSpec:
+    return AnimationSpec(scenes=list(scenes))
+
+
+def _video_stream(fps: str = "30/1", width: int = 1920) -> dict[str, Any]:
+    return {
+        "codec_type": "video",
+        "codec_name": "h264",
+        "width": width,
+        "height": 1080,
+        "avg_frame_rate": fps,
+        "pix_fmt": "yuv420p",
+    }
+
+
+@pytest.fixture
+def make_orchestrator(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> Generator[Any, None, None]:
+    """Factory de Orchestrators con el scratch en tmp_path; limpia al final."""
+    monkeypatch.setenv("ANIMATR_TMP", str(tmp_path))
+    created: list[Orchestrator] = []
+
+    def _make(spec: AnimationSpec, **kwargs: Any) -> Orchestrator:
+        orch = Orchestrator(spec, **kwargs)
+        created.append(orch)
+        return orch
+
+    yield _make
+
+    for orch in created:
+        orch.cleanup()
+
+
+def _fake_process_scene(orch: Orchestrator, calls: list[str]) -> Any:
+    """_process_scene falso: escribe un video vacío por escena procesada."""
+    lock = threading.Lock()
+
+    def _process(scene: Scene, audio_future: Any = None) -> dict[str, Any]:
+        with lock:
+            calls.append(scene.id)
+        video = orch._blender_dir / f"{scene.id}.mp4"
+        video.write_bytes(b"video")
+        return {
+            "scene_id": scene.id,
+            "duration": scene.duration_seconds,
+            "final_video": video,
+        }
+
+    return _process
+
+
+class TestRender:
+    """Tests para Orchestrator.render."""
+
+    def test_duplicate_scenes_processed_once(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica que escenas idénticas salvo el id se procesan una vez."""
+        orch = make_orchestrator(
+            _spec(
+                Scene(id="a", duration="2s"),
+                Scene(id="b", duration="3s"),
+                Scene(id="c", duration="2s"),
+            )
+        )
+        calls: list[str] = []
+        updates: list[int] = []
+        orch.on_progress(lambda p: updates.append(p.completed_scenes))
+
+        with patch.object(
+            orch, "_process_scene", side_effect=_fake_process_scene(orch, calls)
+        ), patch.object(orch, "_can_stream_copy", return_value=True), patch(
+            "animatr.orchestrator._run_ffmpeg"
+        ) as run_ffmpeg:
+            output = orch.render(tmp_path / "out.mp4")
+
+        assert sorted(calls) == ["a", "b"]
+        assert orch.progress.completed_scenes == 3
+        assert orch.progress.is_complete
+        assert orch.progress.current_phase == "compose"
+        assert updates == sorted(updates)
+        assert output == tmp_path / "out.mp4"
+
+        # La escena duplicada reutiliza el video de la primera aparición
+        concat = (orch._temp_dir / "concat.txt").read_text().splitlines()
+        video_a = orch._blender_dir / "a.mp4"
+        video_b = orch._blender_dir / "b.mp4"
+        assert concat == [
+            f"file '{video_a}'",
+            f"file '{video_b}'",
+            f"file '{video_a}'",
+        ]
+
+        cmd = run_ffmpeg.call_args.args[0]
+        assert cmd[cmd.index("-c") + 1] == "copy"
+
+    def test_reencodes_when_streams_differ(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica re-encode si las escenas no pueden concatenarse en copy."""
+        orch = make_orchestrator(
+            _spec(Scene(id="a", duration="2s"), Scene(id="b", duration="3s"))
+        )
+
+        with patch.object(
+            orch, "_process_scene", side_effect=_fake_process_scene(orch, [])
+        ), patch.object(orch, "_can_stream_copy", return_value=False), patch(
+            "animatr.orchestrator._run_ffmpeg"
+        ) as run_ffmpeg:
+            orch.render(tmp_path / "out.mp4")
+
+        cmd = run_ffmpeg.call_args.args[0]
+        assert "copy" not in cmd
+        assert cmd[cmd.index("-c:a") + 1] == "aac"
+        assert cmd[cmd.index("-r") + 1] == "30"
+
+    def test_single_scene_skips_ffmpeg(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica que una sola escena se enlaza sin invocar FFmpeg."""
+        orch = make_orchestrator(_spec(Scene(id="only", duration="2s")))
+
+        with patch.object(
+            orch, "_process_scene", side_effect=_fake_process_scene(orch, [])
+        ), patch("animatr.orchestrator._run_ffmpeg") as run_ffmpeg:
+            output = orch.render(tmp_path / "final" / "out.mp4")
+
+        run_ffmpeg.assert_not_called()
+        assert output.read_bytes() == b"video"
+
+    def test_single_cached_scene_is_copied(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica que el video final no es un hardlink al cache de renders."""
+        cache_dir = tmp_path / "render_cache"
+        cache_dir.mkdir()
+        entry = cache_dir / "only_abc.mp4"
+        entry.write_bytes(b"cached")
+        orch = make_orchestrator(
+            _spec(Scene(id="only", duration="2s")), render_cache_dir=cache_dir
+        )
+
+        output = orch._link_or_copy(entry, tmp_path / "out.mp4")
+        output.write_bytes(b"edited")
+
+        assert entry.read_bytes() == b"cached"
+
+    def test_render_job_tracking(
+        self, make_orchestrator: Any, temp_db: ProjectManager, tmp_path: Path
+    ) -> None:
+        """Verifica que el job de render refleja el resultado final."""
+        project = temp_db.create_project(name="Render")
+        job = temp_db.create_render_job(project.id, total_scenes=2)  # type: ignore
+        orch = make_orchestrator(
+            _spec(Scene(id="a", duration="2s"), Scene(id="b", duration="3s")),
+            project_manager=temp_db,
+            render_job_id=job.id,
+        )
+
+        with patch.object(
+            orch, "_process_scene", side_effect=_fake_process_scene(orch, [])
+        ), patch.object(orch, "_can_stream_copy", return_value=True), patch(
+            "animatr.orchestrator._run_ffmpeg"
+        ):
+            orch.render(tmp_path / "out.mp4")
+
+        stored = temp_db.get_render_job(job.id)  # type: ignore
+        assert stored is not None
+        assert stored.status == RenderStatus.COMPLETED
+        assert stored.total_scenes == 2
+        assert stored.completed_scenes == 2
+        assert stored.progress == 1.0
+
+    def test_progress_writes_are_throttled(self, make_orchestrator: Any) -> None:
+        """Verifica que los cambios de fase no fuerzan una escritura cada uno."""
+        orch = make_orchestrator(
+            _spec(*[Scene(id=f"s{i}", duration=f"{i + 1}s") for i in range(200)]),
+            project_manager=MagicMock(),
+            render_job_id=1,
+        )
+        update = orch.project_manager.update_render_job
+
+        with patch("animatr.orchestrator.time.monotonic", return_value=1000.0):
+            for scene in orch.spec.scenes[:5]:
+                for phase in ("audio", "moho", "blender"):
+                    orch._update_phase(scene.id, phase)
+        assert update.call_count == 1
+
+        # Pasados 250 ms se vuelve a escribir
+        with patch("animatr.orchestrator.time.monotonic", return_value=1000.3):
+            orch._update_phase("s5", "audio")
+        assert update.call_count == 2
+
+
+class TestProcessScene:
+    """Tests para Orchestrator._process_scene con engines mockeados."""
+
+    def test_builds_blender_config(self, make_orchestrator: Any) -> None:
+        """Verifica la configuración que recibe el Blender Engine."""
+        orch = make_orchestrator(_spec(Scene(id="a", duration="2s")))
+        orch._blender_engine = MagicMock()
+        orch._blender_engine.process.return_value = BlenderResult(
+            scene_id="a", output_path=Path("/tmp/a.mp4"), duration=2.0
+        )
+
+        result = orch._process_scene(orch.spec.scenes[0])
+
+        config = orch._blender_engine.process.call_args.args[0]
+        assert isinstance(config, BlenderSceneConfig)
+        assert (config.width, config.height, config.fps) == (1920, 1080, 30)
+        assert config.duration == 2.0
+        assert config.background == Background(color="#1E3A5F")
+        assert config.character_frames_dir is None
+        assert result["final_video"] == Path("/tmp/a.mp4")
+
+    def test_character_scene_passes_frames_to_blender(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica el paso de audio y frames de Moho a Blender."""
+        scene = Scene(
+            id="a",
+            duration="2s",
+            character=Character(asset="presenter.moho", position="left"),
+            audio=AudioConfig(text="Hola"),
+        )
+        orch = make_orchestrator(_spec(scene))
+        audio_file = tmp_path / "a.mp3"
+        orch._audio_engine = MagicMock()
+        orch._audio_engine.process.return_value = EngineResult(
+            scene_id="audio", output_path=audio_file, duration=1.5
+        )
+        orch._moho_engine = MagicMock()
+        orch._moho_engine.process.return_value = MohoResult(
+            scene_id="moho",
+            output_path=tmp_path / "frames",
+            duration=1.5,
+            lip_sync_applied=True,
+        )
+        orch._blender_engine = MagicMock()
+        orch._blender_engine.process.return_value = BlenderResult(
+            scene_id="a", output_path=None, duration=1.5
+        )
+
+        result = orch._process_scene(scene)
+
+        moho_config = orch._moho_engine.process.call_args.args[0]
+        assert isinstance(moho_config, MohoConfig)
+        assert moho_config.audio_path == audio_file
+        assert moho_config.duration == 1.5
+        config = orch._blender_engine.process.call_args.args[0]
+        assert config.character_frames_dir == tmp_path / "frames"
+        assert config.character_position == "left"
+        assert config.audio_path == audio_file
+        assert result["moho"]["lip_sync"] is True
+
+    def test_engines_built_once_across_workers(self, make_orchestrator: Any) -> None:
+        """Verifica que los workers comparten un único engine."""
+        orch = make_orchestrator(_spec(Scene(id="a", duration="2s")))
+        barrier = threading.Barrier(8)
+        engines: list[Any] = []
+
+        def _read() -> None:
+            barrier.wait()
+            engines.append(orch.blender_engine)
+
+        with patch("animatr.orchestrator.BlenderEngine") as engine_cls:
+            threads = [threading.Thread(target=_read) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        engine_cls.assert_called_once()
+        assert len({id(engine) for engine in engines}) == 1
+
+
+class TestTTSCache:
+    """Tests para el cache de TTS por contenido."""
+
+    def test_cache_hit_skips_provider(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica que el mismo texto normalizado no se vuelve a sintetizar."""
+        audio_file = tmp_path / "tts.mp3"
+        audio_file.write_bytes(b"mp3")
+        orch = make_orchestrator(
+            _spec(Scene(id="a", duration="2s")), tts_cache_dir=tmp_path / "tts"
+        )
+        orch._audio_engine = MagicMock()
+        orch._audio_engine.process.return_value = EngineResult(
+            scene_id="audio", output_path=audio_file, duration=1.5
+        )
+
+        first = orch._synthesize_audio(AudioConfig(text="Hola  mundo"), "a")
+        second = orch._synthesize_audio(AudioConfig(text="Hola mundo\n"), "b")
+
+        orch._audio_engine.process.assert_called_once()
+        assert first == second
+        assert first[0].parent == tmp_path / "tts"
+        assert first[0].read_bytes() == b"mp3"
+        assert first[1] == 1.5
+
+    def test_different_voice_misses(
+        self, make_orchestrator: Any, tmp_path: Path
+    ) -> None:
+        """Verifica que la voz forma parte de la clave del cache."""
+        audio_file = tmp_path / "tts.mp3"
+        audio_file.write_bytes(b"mp3")
+        orch = make_orchestrator(
+            _spec(Scene(id="a", duration="2s")), tts_cache_dir=tmp_path / "tts"
+        )
+        orch._audio_engine = MagicMock()
+        orch._audio_engine.process.return_value = EngineResult(
+            scene_id="audio", output_path=audio_file, duration=1.5
+        )
+
+        orch._synthesize_audio(AudioConfig(text="Hola", voice="alloy"), "a")
+        orch._synthesize_audio(AudioConfig(text="Hola", voice="nova"), "b")
+
+        assert orch._audio_engine.process.call_count == 2
+
+    def test_missing_audio_raises(self, make_orchestrator: Any, tmp_path: Path) -> None:
+        """Verifica que no se cachea nada si el TTS no devuelve archivo."""
+        orch = make_orchestrator(
+            _spec(Scene(id="a", duration="2s")), tts_cache_dir=tmp_path / "tts"
+        )
+        orch._audio_engine = MagicMock()
+        orch._audio_engine.process.return_value = EngineResult(
+            scene_id="audio", output_path=None, duration=0.0
+        )
+
+        with pytest.raises(RuntimeError):
+            orch._synthesize_audio(AudioConfig(text="Hola"), "a")
+        assert not (tmp_path / "tts").exists()
+
+
+class TestStreamCopy:
+    """Tests para la decisión de concatenar sin re-encode."""
+
+    def test_matching_streams(self, make_orchestrator: Any) -> None:
+        """Verifica stream copy con codec, tamaño y fps del OutputConfig."""
+        orch = make_orchestrator(_spec(Scene(id="a", duration="2s")))
+        with patch.object(orch, "_probe_streams", return_value=[_video_stream()]):
+            assert orch._can_stream_copy([Path("a.mp4"), Path("b.mp4")])
+
+    @pytest.mark.parametrize(
+        "streams",
+        [
+            None,
+            [_video_stream(fps="25/1")],
+            [_video_stream(width=1280)],
+            [_video_stream(), {"codec_type": "audio", "codec_name": "mp3"}],
+        ],
+    )
+    def test_mismatched_streams(
+        self, make_orchestrator: Any, streams: list[dict[str, Any]] | None
+    ) -> None:
+        """Verifica re-encode si un video no coincide con la salida."""
+        orch = make_orchestrator(_spec(Scene(id="a", duration="2s")))
+        with patch.object(orch, "_probe_streams", return_value=streams):
+            assert not orch._can_stream_copy([Path("a.mp4"), Path("b.mp4")])
+
+    def test_mixed_audio_layouts(self, make_orchestrator: Any) -> None:
+        """Verifica re-encode si unas escenas tienen audio y otras no."""
+        orch = make_orchestrator(_spec(Scene(id="a", duration="2s")))
+        audio = {
+            "codec_type": "audio",
+            "codec_name": "aac",
+            "sample_rate": "44100",
+            "channel_layout": "stereo",
+        }
+        probes = {"a.mp4": [_video_stream(), audio], "b.mp4": [_video_stream()]}
+        with patch.object(orch, "_probe_streams", side_effect=probes.__getitem__):
+            assert not orch._can_stream_copy([Path("a.mp4"), Path("b.mp4")])
+
+
+def test_render_progress_weights() -> None:
+    """Verifica el progreso parcial por fase."""
+    progress = RenderProgress(total_scenes=2, completed_scenes=1)
+    progress.update("b", "moho")
+    assert progress.progress == pytest.approx(0.5 + 0.4 / 2)
@@ -1,8 +1,5 @@
 """Tests para los modelos Pydantic de ANIMATR."""
 
-import tempfile
-from pathlib import Path
-
 import pytest
 import yaml
 
@@ -28,11 +25,26 @@ class TestOutputConfig:
         assert config.width == 1280
         assert config.height == 720
 
-    def test_fps_validation(self):
-        with pytest.raises(ValueError):
-            OutputConfig(fps=0)
+    def test_dimensions_follow_copy(self):
+        config = OutputConfig()
+        assert config.width == 1920
+        copy = config.model_copy(update={"resolution": "1280x720"})
+        assert (copy.width, copy.height) == (1280, 720)
+
+    @pytest.mark.parametrize("fps", [0, 200])
+    def test_fps_validation(self, fps):
         with pytest.raises(ValueError):
-            OutputConfig(fps=200)
+            OutputConfig(fps=fps)
+
+    def test_color_source(self):
+        config = OutputConfig(resolution="1280x720", fps=24)
+        red = Background(color="#FF0000").ffmpeg_color
+        source = config.color_source.format(color=red)
+        assert source == "color=c=0xFF0000:s=1280x720:r=24"
+        assert Background().ffmpeg_color == "0x1E3A5F"
+        background = Background(color="#FF0000")
+        assert background.ffmpeg_color == "0xFF0000"
+        assert background.model_copy(update={"color": None}).ffmpeg_color == "0x1E3A5F"
 
 
 class TestAudioConfig:
@@ -46,11 +58,10 @@ class TestAudioConfig:
         with pytest.raises(ValueError):
             AudioConfig(text="")
 
-    def test_speed_bounds(self):
+    @pytest.mark.parametrize("speed", [0.1, 3.0])
+    def test_speed_bounds(self, speed):
         with pytest.raises(ValueError):
-            AudioConfig(text="test", speed=0.1)
-        with pytest.raises(ValueError):
-            AudioConfig(text="test", speed=3.0)
+            AudioConfig(text="test", speed=speed)
 
 
 class TestCharacter:
@@ -60,9 +71,10 @@ class TestCharacter:
         assert char.expression == "neutral"
         assert char.scale == 1.0
 
-    def test_scale_bounds(self):
+    @pytest.mark.parametrize("scale", [0.05, 3.5])
+    def test_scale_bounds(self, scale):
         with pytest.raises(ValueError):
-            Character(asset="./char.moho", scale=0.05)
+            Character(asset="./char.moho", scale=scale)
 
 
 class TestScene:
@@ -73,10 +85,23 @@ class TestScene:
         scene = Scene(id="intro", duration="2.5s")
         assert scene.duration_seconds == 2.5
 
+    def test_duration_follows_copy_and_assignment(self):
+        scene = Scene(id="intro", duration="5s")
+        assert scene.duration_seconds == 5.0
+        assert scene.model_copy(update={"duration": "7s"}).duration_seconds == 7.0
+        scene.duration = "3s"
+        assert scene.duration_seconds == 3.0
+
     def test_invalid_duration(self):
         with pytest.raises(ValueError):
             Scene(id="intro", duration="5")
 
+    def test_zero_duration_fails(self):
+        with pytest.raises(ValueError):
+            Scene(id="intro", duration="0s")
+        with pytest.raises(ValueError):
+            Scene(id="intro", duration="0.0s")
+
     def test_full_scene(self):
         scene = Scene(
             id="test",
@@ -90,33 +115,46 @@ class TestScene:
         assert scene.audio is not None
 
 
-class TestAnimationSpec:
-    def test_from_yaml(self):
-        spec_data = {
-            "version": "1.0",
-            "output": {"format": "mp4", "resolution": "1920x1080", "fps": 30},
-            "scenes": [
-                {
-                    "id": "intro",
-                    "duration": "5s",
-                    "audio": {"text": "Hola mundo", "voice": "alloy"},
-                }
-            ],
+# Leído por test_from_yaml; se construye una vez al importar
+SPEC_DATA = {
+    "version": "1.0",
+    "output": {"format": "mp4", "resolution": "1920x1080", "fps": 30},
+    "scenes": [
+        {
+            "id": "intro",
+            "duration": "5s",
+            "audio": {"text": "Hola mundo", "voice": "alloy"},
         }
+    ],
+}
+
 
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".yaml", delete=False
-        ) as f:
-            yaml.dump(spec_data, f)
-            temp_path = Path(f.name)
-
-        try:
-            spec = AnimationSpec.from_yaml(temp_path)
-            assert spec.version == "1.0"
-            assert len(spec.scenes) == 1
-            assert spec.scenes[0].id == "intro"
-        finally:
-            temp_path.unlink()
+class TestAnimationSpec:
+    def test_from_yaml(self):
+        spec = AnimationSpec.from_yaml_string(yaml.safe_dump(SPEC_DATA))
+        assert spec.version == "1.0"
+        assert len(spec.scenes) == 1
+        assert spec.scenes[0].id == "intro"
+
+    def test_yaml_string_roundtrip(self):
+        original = AnimationSpec.model_validate(SPEC_DATA)
+        loaded = AnimationSpec.from_yaml_string(original.to_yaml_string())
+        assert loaded == original
+
+    def test_yaml_file_roundtrip(self, tmp_path):
+        # Único test que pasa por disco (to_yaml/from_yaml)
+        original = AnimationSpec.model_validate(SPEC_DATA)
+        path = tmp_path / "spec.yaml"
+        original.to_yaml(path)
+        assert AnimationSpec.from_yaml(path) == original
+
+    def test_total_duration_follows_scenes(self):
+        spec = AnimationSpec.model_validate(SPEC_DATA)
+        assert spec.total_duration == 5.0
+        spec.scenes.append(Scene(id="outro", duration="2s"))
+        assert spec.total_duration == 7.0
+        copy = spec.model_copy(update={"scenes": [Scene(id="x", duration="1s")]})
+        assert copy.total_duration == 1.0
 
     def test_empty_scenes_fails(self):
         with pytest.raises(ValueError):